@@ -1,8 +1,16 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.openapi.utils import get_openapi
-from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from routes import expenses_router, types_router
+from services import (
+    ExpenseService,
+    ExpenseTypeService,
+    get_expense_service,
+    get_expense_type_service,
+)
 from dotenv import load_dotenv
+from common.app import create_app, mongo_resource, redis_resource
+from common.redis import CacheWarmer
+from common.mongo import CacheWatcher, start_cache_watchers
 
 load_dotenv()
 
@@ -17,62 +25,40 @@ tags_metadata = [
     },
 ]
 
-app = FastAPI(
-    title="FastRetail API - Trips Section",
-    description="Manage expenses, including flexible schema for different expense types.",
-    version="1.0.0",
-    openapi_tags=tags_metadata,
-    license_info={
-        "name": "Apache 2.0",
-        "identifier": "MIT",
-    },
-)
 
-app.include_router(expenses_router, prefix="/expenses", tags=["expenses"])
-app.include_router(types_router, prefix="/expenses/types", tags=["types"])
-
-security_scheme = {
-    "bearerAuth": {
-        "type": "http",
-        "scheme": "bearer",
-        "bearerFormat": "JWT",
-    }
-}
-
-
-def custom_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        routes=app.routes,
-        openapi_version=app.openapi_version,
-        description=app.description,
-        license_info=app.license_info,
-        tags=app.openapi_tags,
+@asynccontextmanager
+async def cache_watchers(app: FastAPI):
+    watchers = await start_cache_watchers(
+        CacheWatcher(ExpenseService._get_collection(), "expense:details", "expenses"),
+        CacheWatcher(
+            ExpenseTypeService._get_collection(),
+            "expense_type:details",
+            "expense_types",
+        ),
     )
-    openapi_schema["components"]["securitySchemes"] = security_scheme
-    openapi_schema["security"] = [{"bearerAuth": []}]
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
+    yield
+    for watcher in watchers:
+        await watcher.stop()
 
-app.openapi = custom_openapi
 
-
-@app.get("/api-expenses/openapi.json", include_in_schema=False)
-async def get_openapi_schema():
-    return custom_openapi()
-
-
-@app.get("/expenses-docs", include_in_schema=False)
-async def redoc_html():
-    return get_redoc_html(openapi_url="/api-expenses/openapi.json", title=app.title)
-
-
-@app.get("/expenses-swagger", include_in_schema=False)
-async def swagger_html():
-    return get_swagger_ui_html(
-        openapi_url="/api-expenses/openapi.json", title=app.title
-    )
+app = create_app(
+    "expenses",
+    title="FastRetail API - Trips Section",
+    description="Manage expenses, including flexible schema for different expense types.",
+    tags_metadata=tags_metadata,
+    routers=[
+        (expenses_router, "/expenses", ["expenses"]),
+        (types_router, "/expenses/types", ["types"]),
+    ],
+    resources=[mongo_resource(), redis_resource()],
+    tasks=[
+        CacheWarmer(
+            {
+                "expenses": get_expense_service().get_expenses,
+                "expense_types": get_expense_type_service().get_expense_types,
+            }
+        ).run,
+    ],
+    lifespan=cache_watchers,
+    idempotency=True,
+)
@@ -1,18 +1,27 @@
 from http import HTTPStatus
 from fastapi import APIRouter, Query, Path, Depends
-from schemas import ExpensesPublic, ExpensePublic, ExpenseCreate, ExpenseUpdate
+from schemas import (
+    ExpensesPublic,
+    ExpensePublic,
+    ExpenseCreate,
+    ExpenseUpdate,
+    ExpensesBatchPublic,
+)
 from common.schemas import Unauthorized
-from typing import Optional
+from common.app import ModelResponseRoute
+from typing import List, Optional
 from services import ExpenseService, get_expense_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get(
     "/",
     status_code=HTTPStatus.OK,
-    response_model=ExpensesPublic,
-    responses={401: {"model": Unauthorized}},
+    # Items only carry the requested fields, so the page is documented here
+    # instead of being validated against the full model.
+    response_model=None,
+    responses={200: {"model": ExpensesPublic}, 401: {"model": Unauthorized}},
     summary="Retrieve Expenses",
     description="Retrieve a list of expenses with pagination and optional filtering.",
 )
@@ -29,9 +38,30 @@ async def read_expenses(
         description="Sort by fields like [amount, incurred_date, created_at]",
     ),
     type_filter: Optional[str] = Query(None, description="Filter by expense type"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,amount,incurred_date; default is every field but details",
+    ),
+    service: ExpenseService = Depends(get_expense_service),
+):
+    return await service.get_expenses(page, order, sort, type_filter, fields)
+
+
+@router.get(
+    "/batch",
+    status_code=HTTPStatus.OK,
+    response_model=ExpensesBatchPublic,
+    responses={401: {"model": Unauthorized}},
+    summary="Retrieve Expenses by ID",
+    description="Retrieve up to 200 expenses in one call, e.g. ?ids=a&ids=b. Ids that do not exist are listed in missing.",
+)
+async def read_expenses_batch(
+    ids: List[str] = Query(
+        ..., min_length=1, max_length=200, description="IDs of the expenses to retrieve"
+    ),
     service: ExpenseService = Depends(get_expense_service),
 ):
-    return await service.get_expenses(page, order, sort, type_filter)
+    return await service.get_expenses_batch(ids)
 
 
 @router.get(
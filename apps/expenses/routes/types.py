@@ -5,19 +5,23 @@ from schemas import (
     ExpenseTypePublic,
     ExpenseTypeCreate,
     ExpenseTypeUpdate,
+    ExpenseTypesBatchPublic,
 )
 from common.schemas import Unauthorized
-from typing import Optional
+from common.app import ModelResponseRoute
+from typing import List, Optional
 from services import ExpenseTypeService, get_expense_type_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get(
     "/",
     status_code=HTTPStatus.OK,
-    response_model=ExpenseTypesPublic,
-    responses={401: {"model": Unauthorized}},
+    # Items only carry the requested fields, so the page is documented here
+    # instead of being validated against the full model.
+    response_model=None,
+    responses={200: {"model": ExpenseTypesPublic}, 401: {"model": Unauthorized}},
     summary="Retrieve Expense Types",
     description="Retrieve a list of expense types with pagination and optional sorting.",
 )
@@ -31,9 +35,33 @@ async def read_expense_types(
     sort: Optional[str] = Query(
         None, regex="^(name|created_at)$", description="Sort type: [name, created_at]"
     ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,name,max_reimbursement; default is every field",
+    ),
+    service: ExpenseTypeService = Depends(get_expense_type_service),
+):
+    return await service.get_expense_types(page, order, sort, fields)
+
+
+@router.get(
+    "/batch",
+    status_code=HTTPStatus.OK,
+    response_model=ExpenseTypesBatchPublic,
+    responses={401: {"model": Unauthorized}},
+    summary="Retrieve Expense Types by ID",
+    description="Retrieve up to 200 expense types in one call, e.g. ?ids=a&ids=b. Ids that do not exist are listed in missing.",
+)
+async def read_expense_types_batch(
+    ids: List[str] = Query(
+        ...,
+        min_length=1,
+        max_length=200,
+        description="IDs of the expense types to retrieve",
+    ),
     service: ExpenseTypeService = Depends(get_expense_type_service),
 ):
-    return await service.get_expense_types(page, order, sort)
+    return await service.get_expense_types_batch(ids)
 
 
 @router.get(
@@ -21,7 +21,12 @@ class ExpensePublic(ExpenseBase):
 class ExpensesPublic(BaseModel):
     data: List[ExpensePublic]
     page: int
-    next: Optional[str]
+    next: Optional[int]
+
+
+class ExpensesBatchPublic(BaseModel):
+    data: List[ExpensePublic]
+    missing: List[str]
 
 
 class ExpenseCreate(ExpenseBase):
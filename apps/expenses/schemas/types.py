@@ -20,7 +20,12 @@ class ExpenseTypePublic(ExpenseTypeBase):
 class ExpenseTypesPublic(BaseModel):
     data: List[ExpenseTypePublic]
     page: int
-    next: Optional[str]
+    next: Optional[int]
+
+
+class ExpenseTypesBatchPublic(BaseModel):
+    data: List[ExpenseTypePublic]
+    missing: List[str]
 
 
 class ExpenseTypeCreate(ExpenseTypeBase):
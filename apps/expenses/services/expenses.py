@@ -1,46 +1,68 @@
-from common.mongo import client
+from common.mongo import client, for_reads, projection, MONGO_READ_STALENESS
+from common.schemas import parse_fields, partial_model, partial_page_model
 from typing import List, Optional
 from datetime import datetime
-from schemas import ExpensesPublic, ExpensePublic
+from schemas import ExpensesPublic, ExpensePublic, ExpensesBatchPublic
 from common.redis import (
+    CACHE_TTL,
     cache_with_expiry,
     cache_with_sliding_expiry,
+    cache_many,
+    build_cache_key,
+    record_access,
     invalidate_cache,
-    invalidate_pattern_cache,
 )
+from common.metrics import timed_phase
 from fastapi import HTTPException
 import re
 from bson import ObjectId
 
+# List pages leave out the free-form details unless asked for via fields=.
+DEFAULT_LIST_FIELDS = ExpensePublic.model_fields.keys() - {"details"}
+
 
 class ExpenseService:
     def __init__(self, expenses_collection: any):
         self.expenses_collection = expenses_collection
+        self.expenses_reads = for_reads(expenses_collection)
 
     async def get_expenses(
-        self, page: int, order: str, sort: str, type_filter: Optional[str] = None
+        self,
+        page: int,
+        order: str,
+        sort: str,
+        type_filter: Optional[str] = None,
+        fields: Optional[str] = None,
     ) -> ExpensesPublic:
-        cache_key = f"expenses:page={page}:order={order}:sort={sort}:type={type_filter or 'all'}"
+        order = "desc" if order == "desc" else "asc"
+        sort = (
+            sort if sort in ["amount", "incurred_date", "created_at"] else "created_at"
+        )
+        selected = parse_fields(fields, ExpensePublic, DEFAULT_LIST_FIELDS)
+        params = {
+            "page": page,
+            "order": order,
+            "sort": sort,
+            "type_filter": type_filter,
+            "fields": ",".join(sorted(selected)),
+        }
+        cache_key = build_cache_key("expenses", **params)
+        item_model = partial_model(ExpensePublic, selected)
+        await record_access("expenses", params)
 
         async def fetch_expenses():
             query = self._build_expense_query(type_filter)
-            sort_order = -1 if order == "desc" else 1
-            sort_field = (
-                sort
-                if sort in ["amount", "incurred_date", "created_at"]
-                else "created_at"
-            )
 
             expenses = (
-                self.expenses_collection.find(query)
-                .sort(sort_field, sort_order)
+                self.expenses_reads.find(query, projection(selected))
+                .sort(sort, -1 if order == "desc" else 1)
                 .skip((page - 1) * 25)
                 .limit(26)
                 .to_list(26)
             )
 
             expenses_public = [
-                ExpensePublic(**self._format_expense(expense)) for expense in expenses
+                item_model(**self._format_expense(expense)) for expense in expenses
             ]
 
             next_page = None
@@ -54,14 +76,21 @@ class ExpenseService:
                 "next": next_page,
             }
 
-        cached_result = await cache_with_expiry(cache_key, fetch_expenses, ttl=300)
-
-        return ExpensesPublic(
-            data=[ExpensePublic(**expense) for expense in cached_result["data"]],
-            page=cached_result["page"],
-            next=cached_result.get("next"),
+        cached_result = await cache_with_expiry(
+            cache_key,
+            fetch_expenses,
+            ttl=CACHE_TTL,
+            namespace="expenses",
+            max_staleness=MONGO_READ_STALENESS,
         )
 
+        with timed_phase("validate"):
+            return partial_page_model(ExpensesPublic, ExpensePublic, selected)(
+                data=[item_model(**expense) for expense in cached_result["data"]],
+                page=cached_result["page"],
+                next=cached_result.get("next"),
+            )
+
     async def get_expense(self, expense_id: str) -> ExpensePublic:
         if not self._is_valid_object_id(expense_id):
             raise HTTPException(status_code=400, detail="Invalid expense ID format")
@@ -77,17 +106,59 @@ class ExpenseService:
             return self._format_expense(expense)
 
         cached_expense = await cache_with_sliding_expiry(
-            cache_key, fetch_expense, ttl=300
+            cache_key, fetch_expense, ttl=CACHE_TTL
         )
         return ExpensePublic(**cached_expense)
 
+    async def get_expenses_batch(self, expense_ids: List[str]) -> ExpensesBatchPublic:
+        expense_ids = list(dict.fromkeys(expense_ids))
+        invalid_ids = [i for i in expense_ids if not self._is_valid_object_id(i)]
+        if invalid_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid expense ID format: {', '.join(invalid_ids)}",
+            )
+
+        async def fetch_expenses(missing: List[str]):
+            expenses = self.expenses_collection.find(
+                {"_id": {"$in": [ObjectId(i) for i in missing]}}
+            ).to_list(len(missing))
+            return {
+                expense["id"]: expense
+                for expense in map(self._format_expense, expenses)
+            }
+
+        cached_expenses = await cache_many(
+            expense_ids,
+            lambda expense_id: f"expense:details:{expense_id}",
+            fetch_expenses,
+            ttl=CACHE_TTL,
+            not_found=lambda expense_id: f"Expense with ID {expense_id} not found",
+        )
+
+        with timed_phase("validate"):
+            return ExpensesBatchPublic(
+                data=[
+                    ExpensePublic(**cached_expenses[expense_id])
+                    for expense_id in expense_ids
+                    if expense_id in cached_expenses
+                ],
+                missing=[
+                    expense_id
+                    for expense_id in expense_ids
+                    if expense_id not in cached_expenses
+                ],
+            )
+
     async def create_expense(self, expense: dict) -> ExpensePublic:
         expense["created_at"] = datetime.utcnow()
         expense["updated_at"] = datetime.utcnow()
         result = self.expenses_collection.insert_one(expense)
         expense["_id"] = str(result.inserted_id)
 
-        await invalidate_pattern_cache("expenses:*")
+        await invalidate_cache(
+            f"expense:details:{expense['_id']}", namespaces=["expenses"]
+        )
         return ExpensePublic(**self._format_expense(expense))
 
     async def update_expense(
@@ -109,8 +180,7 @@ class ExpenseService:
         updated_expense = self.expenses_collection.find_one(
             {"_id": ObjectId(expense_id)}
         )
-        await invalidate_cache(f"expense:details:{expense_id}")
-        await invalidate_pattern_cache("expenses:*")
+        await invalidate_cache(f"expense:details:{expense_id}", namespaces=["expenses"])
         return ExpensePublic(**self._format_expense(updated_expense))
 
     async def delete_expense(self, expense_id: str) -> None:
@@ -125,8 +195,7 @@ class ExpenseService:
                 status_code=404, detail=f"Expense with ID {expense_id} not found"
             )
 
-        await invalidate_cache(f"expense:details:{expense_id}")
-        await invalidate_pattern_cache("expenses:*")
+        await invalidate_cache(f"expense:details:{expense_id}", namespaces=["expenses"])
 
     def _build_expense_query(self, type_filter: Optional[str]) -> dict:
         query = {}
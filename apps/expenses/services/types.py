@@ -1,13 +1,18 @@
-from common.mongo import client
+from common.mongo import client, for_reads, projection, MONGO_READ_STALENESS
+from common.schemas import parse_fields, partial_model, partial_page_model
 from typing import List, Optional
 from datetime import datetime
-from schemas import ExpenseTypesPublic, ExpenseTypePublic
+from schemas import ExpenseTypesPublic, ExpenseTypePublic, ExpenseTypesBatchPublic
 from common.redis import (
+    CACHE_TTL,
     cache_with_expiry,
     cache_with_sliding_expiry,
+    cache_many,
+    build_cache_key,
+    record_access,
     invalidate_cache,
-    invalidate_pattern_cache,
 )
+from common.metrics import timed_phase
 from fastapi import HTTPException
 import re
 from bson import ObjectId
@@ -16,27 +21,37 @@ from bson import ObjectId
 class ExpenseTypeService:
     def __init__(self, expense_types_collection: any):
         self.expense_types_collection = expense_types_collection
+        self.expense_types_reads = for_reads(expense_types_collection)
 
     async def get_expense_types(
-        self, page: int, order: str, sort: str
+        self, page: int, order: str, sort: str, fields: Optional[str] = None
     ) -> ExpenseTypesPublic:
-        cache_key = f"expense_types:page={page}:order={order}:sort={sort}"
+        order = "desc" if order == "desc" else "asc"
+        sort = sort if sort in ["name", "created_at"] else "name"
+        selected = parse_fields(
+            fields, ExpenseTypePublic, ExpenseTypePublic.model_fields
+        )
+        params = {
+            "page": page,
+            "order": order,
+            "sort": sort,
+            "fields": ",".join(sorted(selected)),
+        }
+        cache_key = build_cache_key("expense_types", **params)
+        item_model = partial_model(ExpenseTypePublic, selected)
+        await record_access("expense_types", params)
 
         async def fetch_expense_types():
-            sort_order = -1 if order == "desc" else 1
-            sort_field = sort if sort in ["name", "created_at"] else "name"
-
             expense_types = (
-                self.expense_types_collection.find({})
-                .sort(sort_field, sort_order)
+                self.expense_types_reads.find({}, projection(selected))
+                .sort(sort, -1 if order == "desc" else 1)
                 .skip((page - 1) * 25)
                 .limit(26)
                 .to_list(26)
             )
 
             expense_types_public = [
-                ExpenseTypePublic(**self._format_expense_type(exp))
-                for exp in expense_types
+                item_model(**self._format_expense_type(exp)) for exp in expense_types
             ]
 
             next_page = None
@@ -50,17 +65,23 @@ class ExpenseTypeService:
                 "next": next_page,
             }
 
-        cached_result = await cache_with_expiry(cache_key, fetch_expense_types, ttl=300)
-
-        return ExpenseTypesPublic(
-            data=[
-                ExpenseTypePublic(**expense_type)
-                for expense_type in cached_result["data"]
-            ],
-            page=cached_result["page"],
-            next=cached_result.get("next"),
+        cached_result = await cache_with_expiry(
+            cache_key,
+            fetch_expense_types,
+            ttl=CACHE_TTL,
+            namespace="expense_types",
+            max_staleness=MONGO_READ_STALENESS,
         )
 
+        with timed_phase("validate"):
+            return partial_page_model(ExpenseTypesPublic, ExpenseTypePublic, selected)(
+                data=[
+                    item_model(**expense_type) for expense_type in cached_result["data"]
+                ],
+                page=cached_result["page"],
+                next=cached_result.get("next"),
+            )
+
     async def get_expense_type(self, expense_type_id: str) -> ExpenseTypePublic:
         if not self._is_valid_object_id(expense_type_id):
             raise HTTPException(
@@ -81,17 +102,61 @@ class ExpenseTypeService:
             return self._format_expense_type(expense_type)
 
         cached_expense_type = await cache_with_sliding_expiry(
-            cache_key, fetch_expense_type, ttl=300
+            cache_key, fetch_expense_type, ttl=CACHE_TTL
         )
         return ExpenseTypePublic(**cached_expense_type)
 
+    async def get_expense_types_batch(
+        self, expense_type_ids: List[str]
+    ) -> ExpenseTypesBatchPublic:
+        expense_type_ids = list(dict.fromkeys(expense_type_ids))
+        invalid_ids = [i for i in expense_type_ids if not self._is_valid_object_id(i)]
+        if invalid_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid expense type ID format: {', '.join(invalid_ids)}",
+            )
+
+        async def fetch_expense_types(missing: List[str]):
+            expense_types = self.expense_types_collection.find(
+                {"_id": {"$in": [ObjectId(i) for i in missing]}}
+            ).to_list(len(missing))
+            return {
+                expense_type["id"]: expense_type
+                for expense_type in map(self._format_expense_type, expense_types)
+            }
+
+        cached_expense_types = await cache_many(
+            expense_type_ids,
+            lambda expense_type_id: f"expense_type:details:{expense_type_id}",
+            fetch_expense_types,
+            ttl=CACHE_TTL,
+            not_found=lambda expense_type_id: f"Expense type with ID {expense_type_id} not found",
+        )
+
+        with timed_phase("validate"):
+            return ExpenseTypesBatchPublic(
+                data=[
+                    ExpenseTypePublic(**cached_expense_types[expense_type_id])
+                    for expense_type_id in expense_type_ids
+                    if expense_type_id in cached_expense_types
+                ],
+                missing=[
+                    expense_type_id
+                    for expense_type_id in expense_type_ids
+                    if expense_type_id not in cached_expense_types
+                ],
+            )
+
     async def create_expense_type(self, expense_type: dict) -> ExpenseTypePublic:
         expense_type["created_at"] = datetime.utcnow()
         expense_type["updated_at"] = datetime.utcnow()
         result = self.expense_types_collection.insert_one(expense_type)
         expense_type["_id"] = str(result.inserted_id)
 
-        await invalidate_pattern_cache("expense_types:*")
+        await invalidate_cache(
+            f"expense_type:details:{expense_type['_id']}", namespaces=["expense_types"]
+        )
         return ExpenseTypePublic(**self._format_expense_type(expense_type))
 
     async def update_expense_type(
@@ -116,8 +181,9 @@ class ExpenseTypeService:
         updated_expense_type = self.expense_types_collection.find_one(
             {"_id": ObjectId(expense_type_id)}
         )
-        await invalidate_cache(f"expense_type:details:{expense_type_id}")
-        await invalidate_pattern_cache("expense_types:*")
+        await invalidate_cache(
+            f"expense_type:details:{expense_type_id}", namespaces=["expense_types"]
+        )
         return ExpenseTypePublic(**self._format_expense_type(updated_expense_type))
 
     async def delete_expense_type(self, expense_type_id: str) -> None:
@@ -135,8 +201,9 @@ class ExpenseTypeService:
                 detail=f"Expense type with ID {expense_type_id} not found",
             )
 
-        await invalidate_cache(f"expense_type:details:{expense_type_id}")
-        await invalidate_pattern_cache("expense_types:*")
+        await invalidate_cache(
+            f"expense_type:details:{expense_type_id}", namespaces=["expense_types"]
+        )
 
     def _format_expense_type(self, expense_type: dict) -> dict:
         if expense_type is None:
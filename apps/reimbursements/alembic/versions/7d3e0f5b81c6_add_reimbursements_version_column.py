@@ -0,0 +1,29 @@
+"""Add reimbursements version column
+
+Revision ID: 7d3e0f5b81c6
+Revises: 002d84c849c5
+Create Date: 2026-10-19 17:12:40.218934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3e0f5b81c6"
+down_revision: Union[str, None] = "002d84c849c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reimbursements",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("reimbursements", "version")
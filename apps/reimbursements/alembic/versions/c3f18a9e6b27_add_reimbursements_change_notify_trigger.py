@@ -0,0 +1,49 @@
+"""Add reimbursements change notify trigger
+
+Revision ID: c3f18a9e6b27
+Revises: 7d3e0f5b81c6
+Create Date: 2026-10-19 18:03:27.640291
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f18a9e6b27"
+down_revision: Union[str, None] = "7d3e0f5b81c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_reimbursements_change() RETURNS trigger AS $$
+        DECLARE
+            row_id integer;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := OLD.id;
+            ELSE
+                row_id := NEW.id;
+            END IF;
+            PERFORM pg_notify(
+                'reimbursements_changes',
+                json_build_object('op', TG_OP, 'id', row_id, 'tx', txid_current())::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER reimbursements_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON reimbursements
+        FOR EACH ROW EXECUTE FUNCTION notify_reimbursements_change();
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS reimbursements_notify_change ON reimbursements;")
+    op.execute("DROP FUNCTION IF EXISTS notify_reimbursements_change();")
@@ -1,8 +1,14 @@
-from fastapi import FastAPI
-from fastapi.openapi.utils import get_openapi
-from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from routes import reimbursements_router
+from models import OutboxModel
+from common.rabbitMQ import OutboxRelay, RabbitMQConnection
+from common.postgres import CacheInvalidationListener
 from dotenv import load_dotenv
+from common.app import (
+    create_app,
+    postgres_resource,
+    rabbitmq_resource,
+    redis_resource,
+)
 
 load_dotenv()
 
@@ -13,65 +19,24 @@ tags_metadata = [
     },
 ]
 
-app = FastAPI(
+# Submissions go through the outbox, so the broker can be down without the
+# app being unready; the relay connects to it on its own.
+rabbitmq = RabbitMQConnection(queue="reimbursements.queue")
+
+app = create_app(
+    "reimbursements",
     title="FastRetail API - Reimbursements",
     description="This is a FastRetail API service for reimbursements.",
-    version="1.0.0",
-    openapi_tags=tags_metadata,
-    license_info={
-        "name": "Apache 2.0",
-        "identifier": "MIT",
-    },
-)
-
-app.include_router(
-    reimbursements_router, prefix="/reimbursements", tags=["reimbursements"]
+    tags_metadata=tags_metadata,
+    routers=[(reimbursements_router, "/reimbursements", ["reimbursements"])],
+    resources=[
+        postgres_resource(),
+        redis_resource(),
+        rabbitmq_resource(rabbitmq, required=False),
+    ],
+    tasks=[
+        OutboxRelay(OutboxModel, rabbitmq).run,
+        CacheInvalidationListener("reimbursements_changes", "reimbursements").run,
+    ],
+    idempotency=True,
 )
-
-security_scheme = {
-    "bearerAuth": {
-        "type": "http",
-        "scheme": "bearer",
-        "bearerFormat": "JWT",
-    }
-}
-
-
-def custom_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        routes=app.routes,
-        openapi_version=app.openapi_version,
-        description=app.description,
-        license_info=app.license_info,
-        tags=app.openapi_tags,
-    )
-    openapi_schema["components"]["securitySchemes"] = security_scheme
-    openapi_schema["security"] = [{"bearerAuth": []}]
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
-
-app.openapi = custom_openapi
-
-
-@app.get("/api-reimbursements/openapi.json", include_in_schema=False)
-async def get_openapi_schema():
-    return custom_openapi()
-
-
-@app.get("/reimbursements-docs", include_in_schema=False)
-async def redoc_html():
-    return get_redoc_html(
-        openapi_url="/api-reimbursements/openapi.json", title=app.title
-    )
-
-
-@app.get("/reimbursements-swagger", include_in_schema=False)
-async def swagger_html():
-    return get_swagger_ui_html(
-        openapi_url="/api-reimbursements/openapi.json", title=app.title
-    )
@@ -1,2 +1,3 @@
 from .base import Base
 from .reimbursements import *
+from .outbox import *
@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from sqlalchemy import JSON, DateTime, String, Integer
+from .base import Base
+import datetime
+
+
+class OutboxModel(Base):
+    __tablename__ = "reimbursements_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    routing_key: Mapped[str] = mapped_column(String(255))
+    payload: Mapped[dict] = mapped_column(JSON)
+    headers: Mapped[dict] = mapped_column(JSON, default=dict)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
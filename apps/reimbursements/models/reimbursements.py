@@ -15,6 +15,9 @@ class ReimbursementModel(Base):
     total_amount: Mapped[float] = mapped_column(Float, default=0.0)
     created_at: Mapped[str] = mapped_column(default=datetime.datetime.now().isoformat())
     updated_at: Mapped[str] = mapped_column(default=datetime.datetime.now().isoformat())
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __init__(
         self,
@@ -1,24 +1,30 @@
 from http import HTTPStatus
-from fastapi import APIRouter, Path, Query, Depends
+from fastapi import APIRouter, Header, Response, Path, Query, Depends
 from schemas import (
     ReimbursementsPublic,
     ReimbursementPublic,
     ReimbursementCreate,
     ReimbursementUpdate,
-    ReimbursementCreatePublic
+    ReimbursementCreatePublic,
+    ReimbursementTransition,
+    ReimbursementTransitionsPublic,
 )
 from common.schemas import Unauthorized
+from common.postgres import etag, parse_if_match
+from common.app import ModelResponseRoute
 from typing import Optional
 from services import ReimbursementService, get_reimbursement_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get(
     "/",
     status_code=HTTPStatus.OK,
-    response_model=ReimbursementsPublic,
-    responses={401: {"model": Unauthorized}},
+    # Items only carry the requested fields, so the page is documented here
+    # instead of being validated against the full model.
+    response_model=None,
+    responses={200: {"model": ReimbursementsPublic}, 401: {"model": Unauthorized}},
     summary="Retrieve Reimbursements",
     description="Retrieve a list of reimbursements with pagination and optional filtering.",
 )
@@ -29,9 +35,28 @@ async def read_reimbursements(
     status: Optional[str] = Query(
         None, description="Filter by reimbursement status (Pending, Approved, Rejected)"
     ),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,status,total_amount; default is every field",
+    ),
+    service: ReimbursementService = Depends(get_reimbursement_service),
+):
+    return await service.get_reimbursements(page, status, fields)
+
+
+@router.post(
+    "/transitions",
+    status_code=HTTPStatus.OK,
+    response_model=ReimbursementTransitionsPublic,
+    responses={401: {"model": Unauthorized}},
+    summary="Transition Reimbursements",
+    description="Applies a status change to many reimbursements at once. Pending reimbursements can be Approved or Rejected; results are reported per id.",
+)
+async def transition_reimbursements(
+    transition: ReimbursementTransition,
     service: ReimbursementService = Depends(get_reimbursement_service),
 ):
-    return await service.get_reimbursements(page, status)
+    return await service.transition_reimbursements(transition)
 
 
 @router.get(
@@ -43,12 +68,15 @@ async def read_reimbursements(
     description="Retrieve a single reimbursement.",
 )
 async def read_reimbursement(
+    response: Response,
     reimbursement_id: int = Path(
         ..., description="ID of the reimbursement to retrieve"
     ),
     service: ReimbursementService = Depends(get_reimbursement_service),
 ):
-    return await service.get_reimbursement(reimbursement_id)
+    reimbursement = await service.get_reimbursement(reimbursement_id)
+    response.headers["ETag"] = etag(reimbursement.version)
+    return reimbursement
 
 
 @router.post(
@@ -72,13 +100,19 @@ async def create_reimbursement(
     response_model=ReimbursementPublic,
     responses={401: {"model": Unauthorized}},
     summary="Update Reimbursement",
-    description="Updates a reimbursement.",
+    description="Updates a reimbursement. Send the ETag from a previous read as If-Match to fail with 412 instead of overwriting a concurrent change. A status change that the bulk transitions endpoint would reject fails with 409.",
 )
 async def update_reimbursement(
     reimbursement_update: ReimbursementUpdate,
+    response: Response,
     reimbursement_id: int = Path(..., description="ID of the reimbursement to update"),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the version being updated"
+    ),
     service: ReimbursementService = Depends(get_reimbursement_service),
 ):
-    return await service.update_reimbursement(reimbursement_id, reimbursement_update)
-
-    return await service.update_reimbursement(reimbursement_id, reimbursement_update)
\ No newline at end of file
+    reimbursement = await service.update_reimbursement(
+        reimbursement_id, reimbursement_update, parse_if_match(if_match)
+    )
+    response.headers["ETag"] = etag(reimbursement.version)
+    return reimbursement
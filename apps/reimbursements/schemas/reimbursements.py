@@ -1,7 +1,7 @@
 from typing import List, Optional
 from sqlmodel import SQLModel, Field
 import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field as PydanticField
 
 
 class ReimbursementBase(SQLModel):
@@ -15,12 +15,13 @@ class ReimbursementPublic(ReimbursementBase):
     id: int
     created_at: datetime.datetime
     updated_at: datetime.datetime
+    version: int
 
 
 class ReimbursementsPublic(SQLModel):
     data: List[ReimbursementPublic]
     page: int
-    next: Optional[str]
+    next: Optional[int]
 
 
 class ReimbursementCreate(ReimbursementBase):
@@ -33,5 +34,22 @@ class ReimbursementUpdate(SQLModel):
     expense_ids: Optional[List[int]]
     total_amount: Optional[float]
 
+
 class ReimbursementCreatePublic(BaseModel):
     message: str
+
+
+class ReimbursementTransition(BaseModel):
+    ids: List[int] = PydanticField(..., min_length=1, max_length=500)
+    status: str
+
+
+class ReimbursementTransitionResult(BaseModel):
+    id: int
+    result: str
+    status: Optional[str] = None
+
+
+class ReimbursementTransitionsPublic(BaseModel):
+    updated: int
+    results: List[ReimbursementTransitionResult]
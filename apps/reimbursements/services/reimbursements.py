@@ -1,37 +1,103 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, insert, bindparam, any_
+from sqlalchemy.dialects.postgresql import ARRAY
 from fastapi import HTTPException, Depends
 from schemas import (
     ReimbursementPublic,
     ReimbursementsPublic,
     ReimbursementCreate,
     ReimbursementUpdate,
+    ReimbursementTransition,
+    ReimbursementTransitionResult,
+    ReimbursementTransitionsPublic,
 )
-from common.rabbitMQ import get_reimbursements_rabbitmq
-from common.postgres import paginate_query, get_db
-from typing import Optional
+from models import ReimbursementModel, OutboxModel
+from common.postgres import (
+    paginate_rows,
+    get_db,
+    get_read_db,
+    read_staleness,
+    check_version,
+    commit_versioned,
+)
+from common.metrics import timed_phase
+from common.schemas import parse_fields, partial_model, partial_page_model
+from common.redis import (
+    CACHE_TTL,
+    cache_with_expiry,
+    invalidate_cache,
+    build_cache_key,
+)
+from typing import Optional, Set
+import datetime
+
+STATUS_TRANSITIONS = {
+    "Pending": {"Approved", "Rejected"},
+    "Approved": set(),
+    "Rejected": set(),
+}
 
 
 class ReimbursementService:
-    def __init__(self, db_session: AsyncSession, reimbursements_rabbitmq):
+    def __init__(
+        self, db_session: AsyncSession, read_session: Optional[AsyncSession] = None
+    ):
         self.db_session = db_session
-        self.reimbursements_rabbitmq = reimbursements_rabbitmq
+        # Reads may go to a replica; list cache fills are held back while the
+        # replica could still miss the latest invalidated write. Writes and
+        # read-modify-write use db_session.
+        self.read_session = read_session or db_session
 
     async def get_reimbursements(
-        self, page: int, status: Optional[str]
+        self, page: int, status: Optional[str], fields: Optional[str] = None
     ) -> ReimbursementsPublic:
-        query = select(ReimbursementModel)
-        if status:
-            query = query.where(ReimbursementModel.status == status)
+        selected = parse_fields(
+            fields, ReimbursementPublic, ReimbursementPublic.model_fields
+        )
+        cache_key = build_cache_key(
+            "reimbursements",
+            page=page,
+            status=status,
+            fields=",".join(sorted(selected)),
+        )
+        item_model = partial_model(ReimbursementPublic, selected)
 
-        reimbursements = await paginate_query(self.db_session, query, page, 26)
-        data = [ReimbursementPublic.from_orm(r) for r in reimbursements]
+        async def fetch_reimbursements():
+            query = select(
+                *(getattr(ReimbursementModel, column) for column in sorted(selected))
+            )
+            if status:
+                query = query.where(ReimbursementModel.status == status)
 
-        next_page = page + 1 if len(data) > 25 else None
-        return ReimbursementsPublic(data=data[:25], page=page, next=next_page)
+            reimbursements = await paginate_rows(self.read_session, query, page, 26)
+            data = [item_model.model_validate(r) for r in reimbursements]
+
+            next_page = page + 1 if len(data) > 25 else None
+            return {
+                "data": [r.dict() for r in data[:25]],
+                "page": page,
+                "next": next_page,
+            }
+
+        cached_result = await cache_with_expiry(
+            cache_key,
+            fetch_reimbursements,
+            ttl=CACHE_TTL,
+            namespace="reimbursements",
+            max_staleness=read_staleness(self.read_session),
+        )
+
+        with timed_phase("validate"):
+            return partial_page_model(
+                ReimbursementsPublic, ReimbursementPublic, selected
+            )(
+                data=[item_model(**r) for r in cached_result["data"]],
+                page=cached_result["page"],
+                next=cached_result.get("next"),
+            )
 
     async def get_reimbursement(self, reimbursement_id: int) -> ReimbursementPublic:
-        query = await self.db_session.execute(
+        query = await self.read_session.execute(
             select(ReimbursementModel).where(ReimbursementModel.id == reimbursement_id)
         )
         reimbursement = query.scalars().first()
@@ -40,19 +106,42 @@ class ReimbursementService:
         return ReimbursementPublic.from_orm(reimbursement)
 
     async def create_reimbursement(self, reimbursement_in: ReimbursementCreate):
-        self.reimbursements_rabbitmq.publish(
-            message=reimbursement_in.dict(),
-            routing_key="reimbursements.queue",
-            headers={
-                "event": "reimbursement.submitted",
-                "user": "1"
-            },
+        # Submissions always start Pending; only transitions move them on.
+        reimbursement = ReimbursementModel(
+            user_id=reimbursement_in.user_id,
+            trip_id=reimbursement_in.trip_id,
+            status="Pending",
+            total_amount=reimbursement_in.total_amount,
+        )
+        self.db_session.add(reimbursement)
+        await self.db_session.flush()
+
+        self.db_session.add(
+            OutboxModel(
+                routing_key="reimbursements.queue",
+                payload={
+                    **reimbursement_in.dict(),
+                    "id": reimbursement.id,
+                    "status": reimbursement.status,
+                },
+                headers={
+                    "event": "reimbursement.submitted",
+                    "user": str(reimbursement_in.user_id),
+                },
+            )
         )
+        await self.db_session.commit()
+        await invalidate_cache(namespaces=["reimbursements"])
 
-        return {"message": f"Reimbursement request submitted for user {reimbursement_in.user_id}"}
+        return {
+            "message": f"Reimbursement request submitted for user {reimbursement_in.user_id}"
+        }
 
     async def update_reimbursement(
-        self, reimbursement_id: int, reimbursement_update: ReimbursementUpdate
+        self,
+        reimbursement_id: int,
+        reimbursement_update: ReimbursementUpdate,
+        expected_versions: Optional[Set[int]] = None,
     ):
         query = await self.db_session.execute(
             select(ReimbursementModel).where(ReimbursementModel.id == reimbursement_id)
@@ -60,15 +149,126 @@ class ReimbursementService:
         reimbursement = query.scalars().first()
         if not reimbursement:
             raise HTTPException(status_code=404, detail="Reimbursement not found")
+        check_version(reimbursement.version, expected_versions)
+
+        changes = reimbursement_update.dict(exclude_unset=True)
+        status = changes.get("status")
+        if (
+            status is not None
+            and status != reimbursement.status
+            and status not in STATUS_TRANSITIONS.get(reimbursement.status, set())
+        ):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Cannot transition reimbursement from {reimbursement.status} to {status}",
+            )
 
-        for key, value in reimbursement_update.dict(exclude_unset=True).items():
+        for key, value in changes.items():
             setattr(reimbursement, key, value)
 
-        await self.db_session.commit()
+        await commit_versioned(self.db_session)
+        await invalidate_cache(namespaces=["reimbursements"])
         await self.db_session.refresh(reimbursement)
         return ReimbursementPublic.from_orm(reimbursement)
 
+    async def transition_reimbursements(
+        self, transition: ReimbursementTransition
+    ) -> ReimbursementTransitionsPublic:
+        sources = [
+            source
+            for source, targets in STATUS_TRANSITIONS.items()
+            if transition.status in targets
+        ]
+        if not sources:
+            raise HTTPException(
+                status_code=422,
+                detail=f"No reimbursement can transition to {transition.status}",
+            )
+
+        ids = list(dict.fromkeys(transition.ids))
+        id_array = bindparam("ids", ids, type_=ARRAY(ReimbursementModel.id.type))
+
+        with timed_phase("db"):
+            result = await self.db_session.execute(
+                update(ReimbursementModel)
+                .where(ReimbursementModel.id == any_(id_array))
+                .where(ReimbursementModel.status.in_(sources))
+                .values(
+                    status=transition.status,
+                    version=ReimbursementModel.version + 1,
+                    updated_at=datetime.datetime.now().isoformat(),
+                )
+                .returning(
+                    ReimbursementModel.id,
+                    ReimbursementModel.user_id,
+                    ReimbursementModel.trip_id,
+                    ReimbursementModel.total_amount,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            updated = {row.id: row for row in result}
+
+            current = {}
+            skipped = [i for i in ids if i not in updated]
+            if skipped:
+                result = await self.db_session.execute(
+                    select(ReimbursementModel.id, ReimbursementModel.status).where(
+                        ReimbursementModel.id
+                        == any_(
+                            bindparam(
+                                "skipped",
+                                skipped,
+                                type_=ARRAY(ReimbursementModel.id.type),
+                            )
+                        )
+                    )
+                )
+                current = dict(result.all())
+
+            if updated:
+                await self.db_session.execute(
+                    insert(OutboxModel),
+                    [
+                        {
+                            "routing_key": "reimbursements.queue",
+                            "payload": {
+                                "id": row.id,
+                                "user_id": row.user_id,
+                                "trip_id": row.trip_id,
+                                "total_amount": row.total_amount,
+                                "status": transition.status,
+                            },
+                            "headers": {
+                                "event": "reimbursement.updated",
+                                "user": str(row.user_id),
+                            },
+                        }
+                        for row in updated.values()
+                    ],
+                )
+            await self.db_session.commit()
+
+        if updated:
+            await invalidate_cache(namespaces=["reimbursements"])
+
+        results = []
+        for reimbursement_id in ids:
+            if reimbursement_id in updated:
+                outcome, status = "updated", transition.status
+            elif reimbursement_id in current:
+                outcome, status = "invalid_transition", current[reimbursement_id]
+            else:
+                outcome, status = "not_found", None
+            results.append(
+                ReimbursementTransitionResult(
+                    id=reimbursement_id, result=outcome, status=status
+                )
+            )
+        return ReimbursementTransitionsPublic(updated=len(updated), results=results)
+
+
 def get_reimbursement_service(
-    db_session: AsyncSession = Depends(get_db), reimbursements_rabbitmq=Depends(get_reimbursements_rabbitmq)
+    db_session: AsyncSession = Depends(get_db),
+    read_session: AsyncSession = Depends(get_read_db),
 ) -> ReimbursementService:
-    return ReimbursementService(db_session, reimbursements_rabbitmq)
+    return ReimbursementService(db_session, read_session)
@@ -1,8 +1,11 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.openapi.utils import get_openapi
-from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from routes import trips_router
+from services import TripService, get_trip_service
 from dotenv import load_dotenv
+from common.app import create_app, mongo_resource, redis_resource
+from common.redis import CacheWarmer
+from common.mongo import CacheWatcher, start_cache_watchers
 
 load_dotenv()
 
@@ -13,59 +16,25 @@ tags_metadata = [
     },
 ]
 
-app = FastAPI(
-    title="FastRetail API - Trips Section",
-    description="Manage expenses, including flexible schema for different expense types.",
-    version="1.0.0",
-    openapi_tags=tags_metadata,
-    license_info={
-        "name": "Apache 2.0",
-        "identifier": "MIT",
-    },
-)
 
-app.include_router(trips_router, prefix="/trips", tags=["trips"])
-
-security_scheme = {
-    "bearerAuth": {
-        "type": "http",
-        "scheme": "bearer",
-        "bearerFormat": "JWT",
-    }
-}
-
-
-def custom_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        routes=app.routes,
-        openapi_version=app.openapi_version,
-        description=app.description,
-        license_info=app.license_info,
-        tags=app.openapi_tags,
+@asynccontextmanager
+async def cache_watchers(app: FastAPI):
+    watchers = await start_cache_watchers(
+        CacheWatcher(TripService._get_collection(), "trip:details", "trips"),
     )
-    openapi_schema["components"]["securitySchemes"] = security_scheme
-    openapi_schema["security"] = [{"bearerAuth": []}]
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
+    yield
+    for watcher in watchers:
+        await watcher.stop()
 
-app.openapi = custom_openapi
 
-
-@app.get("/api-trips/openapi.json", include_in_schema=False)
-async def get_openapi_schema():
-    return custom_openapi()
-
-
-@app.get("/trips-docs", include_in_schema=False)
-async def redoc_html():
-    return get_redoc_html(openapi_url="/api-trips/openapi.json", title=app.title)
-
-
-@app.get("/trips-swagger", include_in_schema=False)
-async def swagger_html():
-    return get_swagger_ui_html(openapi_url="/api-trips/openapi.json", title=app.title)
+app = create_app(
+    "trips",
+    title="FastRetail API - Trips Section",
+    description="Manage expenses, including flexible schema for different expense types.",
+    tags_metadata=tags_metadata,
+    routers=[(trips_router, "/trips", ["trips"])],
+    resources=[mongo_resource(), redis_resource()],
+    tasks=[CacheWarmer({"trips": get_trip_service().get_trips}).run],
+    lifespan=cache_watchers,
+    idempotency=True,
+)
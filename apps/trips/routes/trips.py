@@ -1,18 +1,21 @@
 from http import HTTPStatus
 from fastapi import APIRouter, Query, Path, Depends
-from schemas import TripsPublic, TripPublic, TripCreate, TripUpdate
+from schemas import TripsPublic, TripPublic, TripCreate, TripUpdate, TripsBatchPublic
 from common.schemas import Unauthorized
-from typing import Optional
+from common.app import ModelResponseRoute
+from typing import List, Optional
 from services import TripService, get_trip_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get(
     "/",
     status_code=HTTPStatus.OK,
-    response_model=TripsPublic,
-    responses={401: {"model": Unauthorized}},
+    # Items only carry the requested fields, so the page is documented here
+    # instead of being validated against the full model.
+    response_model=None,
+    responses={200: {"model": TripsPublic}, 401: {"model": Unauthorized}},
     summary="Retrieve Trips",
     description="Retrieve a list of trips with pagination and optional sorting.",
 )
@@ -33,9 +36,30 @@ async def read_trips(
         description="Sort type: [name, created_at], default is name",
     ),
     name: Optional[str] = Query(None, description="Filter by trip name"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,name; default is every field but observations",
+    ),
+    service: TripService = Depends(get_trip_service),
+):
+    return await service.get_trips(page, order, sort, name, fields)
+
+
+@router.get(
+    "/batch",
+    status_code=HTTPStatus.OK,
+    response_model=TripsBatchPublic,
+    responses={401: {"model": Unauthorized}},
+    summary="Retrieve Trips by ID",
+    description="Retrieve up to 200 trips in one call, e.g. ?ids=a&ids=b. Ids that do not exist are listed in missing.",
+)
+async def read_trips_batch(
+    ids: List[str] = Query(
+        ..., min_length=1, max_length=200, description="IDs of the trips to retrieve"
+    ),
     service: TripService = Depends(get_trip_service),
 ):
-    return await service.get_trips(page, order, sort, name)
+    return await service.get_trips_batch(ids)
 
 
 @router.get(
@@ -32,7 +32,12 @@ class TripPublic(TripBase):
 class TripsPublic(BaseModel):
     data: List[TripPublic]
     page: int
-    next: Optional[str]
+    next: Optional[int]
+
+
+class TripsBatchPublic(BaseModel):
+    data: List[TripPublic]
+    missing: List[str]
 
 
 class TripCreate(TripBase):
@@ -1,41 +1,65 @@
-from common.mongo import client
+from common.mongo import client, for_reads, projection, MONGO_READ_STALENESS
+from common.schemas import parse_fields, partial_model, partial_page_model
 from typing import List, Optional
 from datetime import datetime
-from schemas import TripsPublic, TripPublic
+from schemas import TripsPublic, TripPublic, TripsBatchPublic
 from common.redis import (
+    CACHE_TTL,
     cache_with_expiry,
     cache_with_sliding_expiry,
+    cache_many,
+    build_cache_key,
+    record_access,
     invalidate_cache,
-    invalidate_pattern_cache,
 )
+from common.metrics import timed_phase
 from fastapi import HTTPException
 import re
 from bson import ObjectId
 
+# List pages leave out the free-form observations unless asked for via fields=.
+DEFAULT_LIST_FIELDS = TripPublic.model_fields.keys() - {"observations"}
+
 
 class TripService:
     def __init__(self, trips_collection: any):
         self.trips_collection = trips_collection
+        self.trips_reads = for_reads(trips_collection)
 
     async def get_trips(
-        self, page: int, order: str, sort: str, name: Optional[str] = None
+        self,
+        page: int,
+        order: str,
+        sort: str,
+        name: Optional[str] = None,
+        fields: Optional[str] = None,
     ) -> TripsPublic:
-        cache_key = f"trips:page={page}:order={order}:sort={sort}:name={name or 'all'}"
+        order = "desc" if order == "desc" else "asc"
+        sort = sort if sort in ["name", "created_at"] else "name"
+        selected = parse_fields(fields, TripPublic, DEFAULT_LIST_FIELDS)
+        params = {
+            "page": page,
+            "order": order,
+            "sort": sort,
+            "name": name,
+            "fields": ",".join(sorted(selected)),
+        }
+        cache_key = build_cache_key("trips", **params)
+        item_model = partial_model(TripPublic, selected)
+        await record_access("trips", params)
 
         async def fetch_trips():
             query = self._build_trip_query(name)
-            sort_order = -1 if order == "desc" else 1
-            sort_field = sort if sort in ["name", "created_at"] else "name"
 
             trips = (
-                self.trips_collection.find(query)
-                .sort(sort_field, sort_order)
+                self.trips_reads.find(query, projection(selected))
+                .sort(sort, -1 if order == "desc" else 1)
                 .skip((page - 1) * 25)
                 .limit(26)
                 .to_list(26)
             )
 
-            trips_public = [TripPublic(**self._format_trip(trip)) for trip in trips]
+            trips_public = [item_model(**self._format_trip(trip)) for trip in trips]
 
             next_page = None
             if len(trips_public) > 25:
@@ -48,14 +72,21 @@ class TripService:
                 "next": next_page,
             }
 
-        cached_result = await cache_with_expiry(cache_key, fetch_trips, ttl=300)
-
-        return TripsPublic(
-            data=[TripPublic(**trip) for trip in cached_result["data"]],
-            page=cached_result["page"],
-            next=cached_result.get("next"),
+        cached_result = await cache_with_expiry(
+            cache_key,
+            fetch_trips,
+            ttl=CACHE_TTL,
+            namespace="trips",
+            max_staleness=MONGO_READ_STALENESS,
         )
 
+        with timed_phase("validate"):
+            return partial_page_model(TripsPublic, TripPublic, selected)(
+                data=[item_model(**trip) for trip in cached_result["data"]],
+                page=cached_result["page"],
+                next=cached_result.get("next"),
+            )
+
     async def get_trip(self, trip_id: str) -> TripPublic:
         if not self._is_valid_object_id(trip_id):
             raise HTTPException(status_code=400, detail="Invalid trip ID format")
@@ -70,16 +101,53 @@ class TripService:
                 )
             return self._format_trip(trip)
 
-        cached_trip = await cache_with_sliding_expiry(cache_key, fetch_trip, ttl=300)
+        cached_trip = await cache_with_sliding_expiry(
+            cache_key, fetch_trip, ttl=CACHE_TTL
+        )
         return TripPublic(**cached_trip)
 
+    async def get_trips_batch(self, trip_ids: List[str]) -> TripsBatchPublic:
+        trip_ids = list(dict.fromkeys(trip_ids))
+        invalid_ids = [i for i in trip_ids if not self._is_valid_object_id(i)]
+        if invalid_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid trip ID format: {', '.join(invalid_ids)}",
+            )
+
+        async def fetch_trips(missing: List[str]):
+            trips = self.trips_collection.find(
+                {"_id": {"$in": [ObjectId(i) for i in missing]}}
+            ).to_list(len(missing))
+            return {trip["id"]: trip for trip in map(self._format_trip, trips)}
+
+        cached_trips = await cache_many(
+            trip_ids,
+            lambda trip_id: f"trip:details:{trip_id}",
+            fetch_trips,
+            ttl=CACHE_TTL,
+            not_found=lambda trip_id: f"Trip with ID {trip_id} not found",
+        )
+
+        with timed_phase("validate"):
+            return TripsBatchPublic(
+                data=[
+                    TripPublic(**cached_trips[trip_id])
+                    for trip_id in trip_ids
+                    if trip_id in cached_trips
+                ],
+                missing=[
+                    trip_id for trip_id in trip_ids if trip_id not in cached_trips
+                ],
+            )
+
     async def create_trip(self, trip: dict) -> TripPublic:
         trip["created_at"] = datetime.utcnow()
         trip["updated_at"] = datetime.utcnow()
         result = self.trips_collection.insert_one(trip)
         trip["_id"] = str(result.inserted_id)
 
-        await invalidate_pattern_cache("trips:*")
+        await invalidate_cache(f"trip:details:{trip['_id']}", namespaces=["trips"])
         return TripPublic(**self._format_trip(trip))
 
     async def update_trip(self, trip_id: str, trip_update: dict) -> TripPublic:
@@ -97,8 +165,7 @@ class TripService:
             )
 
         updated_trip = self.trips_collection.find_one({"_id": trip_id})
-        await invalidate_cache(f"trip:details:{trip_id}")
-        await invalidate_pattern_cache("trips:*")
+        await invalidate_cache(f"trip:details:{trip_id}", namespaces=["trips"])
         return TripPublic(**self._format_trip(updated_trip))
 
     async def delete_trip(self, trip_id: str) -> None:
@@ -111,8 +178,7 @@ class TripService:
                 status_code=404, detail=f"Trip with ID {trip_id} not found"
             )
 
-        await invalidate_cache(f"trip:details:{trip_id}")
-        await invalidate_pattern_cache("trips:*")
+        await invalidate_cache(f"trip:details:{trip_id}", namespaces=["trips"])
 
     def _build_trip_query(self, name: Optional[str]) -> dict:
         query = {}
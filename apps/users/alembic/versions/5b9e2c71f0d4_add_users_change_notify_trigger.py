@@ -0,0 +1,49 @@
+"""Add users change notify trigger
+
+Revision ID: 5b9e2c71f0d4
+Revises: a41c7be2d9f3
+Create Date: 2026-10-19 18:03:27.640291
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9e2c71f0d4"
+down_revision: Union[str, None] = "a41c7be2d9f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_users_change() RETURNS trigger AS $$
+        DECLARE
+            row_id integer;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                row_id := OLD.id;
+            ELSE
+                row_id := NEW.id;
+            END IF;
+            PERFORM pg_notify(
+                'users_changes',
+                json_build_object('op', TG_OP, 'id', row_id, 'tx', txid_current())::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+        CREATE TRIGGER users_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_users_change();
+        """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_notify_change ON users;")
+    op.execute("DROP FUNCTION IF EXISTS notify_users_change();")
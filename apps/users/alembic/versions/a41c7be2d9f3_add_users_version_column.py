@@ -0,0 +1,29 @@
+"""Add users version column
+
+Revision ID: a41c7be2d9f3
+Revises: 12e5874f9e60
+Create Date: 2026-10-19 17:12:40.218934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a41c7be2d9f3"
+down_revision: Union[str, None] = "12e5874f9e60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "version")
@@ -1,8 +1,9 @@
-from fastapi import FastAPI
-from fastapi.openapi.utils import get_openapi
-from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from routes import users_router, auth_router, admin_router
+from services import UserService
 from dotenv import load_dotenv
+from common.app import create_app, postgres_resource, redis_resource
+from common.postgres import CacheInvalidationListener, async_session
+from common.redis import CacheWarmer
 
 load_dotenv()
 
@@ -21,61 +22,25 @@ tags_metadata = [
     },
 ]
 
-app = FastAPI(
-    title="FastRetail API - Users Section",
-    description="Manage users, roles, and hierarchical relationships",
-    version="1.0.0",
-    openapi_tags=tags_metadata,
-    license_info={
-        "name": "Apache 2.0",
-        "identifier": "MIT",
-    },
-)
-
-app.include_router(users_router, prefix="/users", tags=["users"])
-app.include_router(auth_router, prefix="/auth", tags=["auth"])
-app.include_router(admin_router, prefix="/admin", tags=["admin"])
-
-security_scheme = {
-    "bearerAuth": {
-        "type": "http",
-        "scheme": "bearer",
-        "bearerFormat": "JWT",
-    }
-}
-
-
-def custom_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema
-    openapi_schema = get_openapi(
-        title=app.title,
-        version=app.version,
-        routes=app.routes,
-        openapi_version=app.openapi_version,
-        description=app.description,
-        license_info=app.license_info,
-        tags=app.openapi_tags,
-    )
-    openapi_schema["components"]["securitySchemes"] = security_scheme
-    openapi_schema["security"] = [{"bearerAuth": []}]
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
 
+async def warm_users(**params):
+    async with async_session() as session:
+        await UserService(session).get_users(**params)
 
-app.openapi = custom_openapi
 
-
-@app.get("/api-users/openapi.json", include_in_schema=False)
-async def get_openapi_schema():
-    return custom_openapi()
-
-
-@app.get("/users-docs", include_in_schema=False)
-async def redoc_html():
-    return get_redoc_html(openapi_url="/api-users/openapi.json", title=app.title)
-
-
-@app.get("/users-swagger", include_in_schema=False)
-async def swagger_html():
-    return get_swagger_ui_html(openapi_url="/api-users/openapi.json", title=app.title)
+app = create_app(
+    "users",
+    title="FastRetail API - Users Section",
+    description="Manage users, roles, and hierarchical relationships",
+    tags_metadata=tags_metadata,
+    routers=[
+        (users_router, "/users", ["users"]),
+        (auth_router, "/auth", ["auth"]),
+        (admin_router, "/admin", ["admin"]),
+    ],
+    resources=[postgres_resource(), redis_resource()],
+    tasks=[
+        CacheInvalidationListener("users_changes", "users", "user:details").run,
+        CacheWarmer({"users": warm_users}).run,
+    ],
+)
@@ -13,6 +13,9 @@ class UserModel(Base):
     is_active: Mapped[bool] = mapped_column(default=True)
     level: Mapped[int] = mapped_column(default=1)
     joined: Mapped[str] = mapped_column(default=datetime.datetime.now().isoformat())
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     def __init__(
         self,
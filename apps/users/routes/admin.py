@@ -1,6 +1,7 @@
 from fastapi import APIRouter
+from common.app import ModelResponseRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get("/")
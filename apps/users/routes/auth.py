@@ -1,9 +1,10 @@
 from http import HTTPStatus
 from fastapi import APIRouter, Depends, Request
+from common.app import ModelResponseRoute
 from schemas import UserLogin, Token
 from services import AuthService, get_auth_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.post(
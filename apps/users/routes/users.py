@@ -1,18 +1,22 @@
 from http import HTTPStatus
-from fastapi import APIRouter, Query, Path, Depends
-from schemas import UsersPublic, UserPublic, UserCreate, UserUpdate
+from fastapi import APIRouter, Header, Response, Query, Path, Depends
+from schemas import UsersPublic, UserPublic, UserCreate, UserUpdate, UsersBatchPublic
 from common.schemas import Unauthorized
-from typing import Optional
+from common.postgres import etag, parse_if_match
+from common.app import ModelResponseRoute
+from typing import List, Optional
 from services import UserService, get_user_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelResponseRoute)
 
 
 @router.get(
     "/",
     status_code=HTTPStatus.OK,
-    response_model=UsersPublic,
-    responses={401: {"model": Unauthorized}},
+    # Items only carry the requested fields, so the page is documented here
+    # instead of being validated against the full model.
+    response_model=None,
+    responses={200: {"model": UsersPublic}, 401: {"model": Unauthorized}},
     summary="Retrieve Users",
     description="Retrieve a list of users with pagination and optional sorting.",
 )
@@ -33,9 +37,30 @@ async def read_users(
         description="Sort type: [username, joined, level], default is username",
     ),
     username: Optional[str] = Query(None, description="Filter by username"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,username,level; default is every field",
+    ),
     service: UserService = Depends(get_user_service),
 ):
-    return await service.get_users(page, order, sort, username)
+    return await service.get_users(page, order, sort, username, fields)
+
+
+@router.get(
+    "/batch",
+    status_code=HTTPStatus.OK,
+    response_model=UsersBatchPublic,
+    responses={401: {"model": Unauthorized}},
+    summary="Retrieve Users by ID",
+    description="Retrieve up to 200 users in one call, e.g. /users/batch?ids=1&ids=2. Ids that do not exist are listed in missing.",
+)
+async def read_users_batch(
+    ids: List[int] = Query(
+        ..., min_length=1, max_length=200, description="IDs of the users to retrieve"
+    ),
+    service: UserService = Depends(get_user_service),
+):
+    return await service.get_users_batch(ids)
 
 
 @router.get(
@@ -47,10 +72,13 @@ async def read_users(
     description="Retrieve a single user.",
 )
 async def read_user(
+    response: Response,
     user_id: int = Path(..., ge=1, description="ID of the user to retrieve"),
     service: UserService = Depends(get_user_service),
 ):
-    return await service.get_user(user_id)
+    user = await service.get_user(user_id)
+    response.headers["ETag"] = etag(user.version)
+    return user
 
 
 @router.post(
@@ -73,14 +101,20 @@ async def create_user(
     response_model=UserPublic,
     responses={401: {"model": Unauthorized}},
     summary="Update User",
-    description="Updates a user.",
+    description="Updates a user. Send the ETag from a previous read as If-Match to fail with 412 instead of overwriting a concurrent change.",
 )
 async def update_user(
     user_update: UserUpdate,
+    response: Response,
     user_id: int = Path(..., ge=1, description="ID of the user to update"),
+    if_match: Optional[str] = Header(
+        None, description="ETag of the version being updated"
+    ),
     service: UserService = Depends(get_user_service),
 ):
-    return await service.update_user(user_id, user_update)
+    user = await service.update_user(user_id, user_update, parse_if_match(if_match))
+    response.headers["ETag"] = etag(user.version)
+    return user
 
 
 @router.delete(
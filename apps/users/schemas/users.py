@@ -15,12 +15,18 @@ class UserPublic(UserBase):
     id: int
     joined: datetime.datetime
     is_active: bool = Field(default=True)
+    version: int
 
 
 class UsersPublic(SQLModel):
     data: List[UserPublic]
     page: int
-    next: Optional[str]
+    next: Optional[int]
+
+
+class UsersBatchPublic(SQLModel):
+    data: List[UserPublic]
+    missing: List[int]
 
 
 class UserCreate(UserBase):
@@ -1,38 +1,72 @@
 import bcrypt
 import json
+from common.metrics import timed_phase
 from fastapi import HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Optional
-from schemas import UsersPublic, UserPublic, UserUpdate
-from common.postgres import get_db
+from typing import FrozenSet, List, Optional, Set
+from schemas import UsersPublic, UserPublic, UserUpdate, UsersBatchPublic
+from common.postgres import get_db, get_read_db, read_staleness
 from common.redis import redis_client
+from common.schemas import parse_fields, partial_model, partial_page_model
 from models import UserModel
 from http import HTTPStatus
-from common.postgres import get_total_count, paginate_query
+from common.postgres import (
+    get_total_count,
+    paginate_rows,
+    check_version,
+    commit_versioned,
+)
 from common.redis import (
+    CACHE_TTL,
     cache_with_expiry,
     cache_with_sliding_expiry,
+    cache_many,
+    build_cache_key,
+    record_access,
     invalidate_cache,
-    invalidate_pattern_cache,
 )
 
 
 class UserService:
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self, db_session: AsyncSession, read_session: Optional[AsyncSession] = None
+    ):
         self.db_session = db_session
+        # List pages may be read from a replica; their cache fills are held
+        # back while the replica could still miss the latest invalidated
+        # write. Detail and batch entries aren't generation-scoped, so they
+        # are filled from the primary, as are writes.
+        self.read_session = read_session or db_session
 
     async def get_users(
-        self, page: int, order: str, sort: str, username: Optional[str]
+        self,
+        page: int,
+        order: str,
+        sort: str,
+        username: Optional[str],
+        fields: Optional[str] = None,
     ) -> UsersPublic:
-        cache_key = (
-            f"users:page={page}:order={order}:sort={sort}:username={username or 'all'}"
-        )
+        order = "desc" if order == "desc" else "asc"
+        sort = sort if sort in ["username", "joined", "level"] else "username"
+        # ILIKE ignores case, so the filter can be folded before keying.
+        username = username.lower() if username else None
+        selected = parse_fields(fields, UserPublic, UserPublic.model_fields)
+        params = {
+            "page": page,
+            "order": order,
+            "sort": sort,
+            "username": username,
+            "fields": ",".join(sorted(selected)),
+        }
+        cache_key = build_cache_key("users", **params)
+        item_model = partial_model(UserPublic, selected)
+        await record_access("users", params)
 
         async def fetch_users():
-            query = self._build_user_query(order, sort, username)
-            users = await paginate_query(self.db_session, query, page, 26)
-            users_public = [UserPublic.from_orm(user) for user in users]
+            query = self._build_user_query(order, sort, username, selected)
+            users = await paginate_rows(self.read_session, query, page, 26)
+            users_public = [item_model.model_validate(user) for user in users]
 
             next_page = None
 
@@ -46,28 +80,69 @@ class UserService:
                 "next": next_page,
             }
 
-        cached_result = await cache_with_expiry(cache_key, fetch_users, ttl=300)
-
-        return UsersPublic(
-            data=[UserPublic(**user) for user in cached_result["data"]],
-            page=cached_result["page"],
-            next=cached_result.get("next"),
+        cached_result = await cache_with_expiry(
+            cache_key,
+            fetch_users,
+            ttl=CACHE_TTL,
+            namespace="users",
+            max_staleness=read_staleness(self.read_session),
         )
 
+        with timed_phase("validate"):
+            return partial_page_model(UsersPublic, UserPublic, selected)(
+                data=[item_model(**user) for user in cached_result["data"]],
+                page=cached_result["page"],
+                next=cached_result.get("next"),
+            )
+
     async def get_user(self, user_id: int) -> UserPublic:
         cache_key = f"user:details:{user_id}"
 
         async def fetch_user():
-            db_user = await self._get_user_by_id(user_id)
+            db_user = await self.db_session.get(UserModel, user_id)
             if not db_user:
                 raise HTTPException(
                     status_code=HTTPStatus.NOT_FOUND, detail="User not found"
                 )
             return UserPublic.from_orm(db_user).dict()
 
-        cached_user = await cache_with_sliding_expiry(cache_key, fetch_user, ttl=300)
+        cached_user = await cache_with_sliding_expiry(
+            cache_key, fetch_user, ttl=CACHE_TTL
+        )
         return UserPublic(**cached_user)
 
+    async def get_users_batch(self, user_ids: List[int]) -> UsersBatchPublic:
+        user_ids = list(dict.fromkeys(user_ids))
+
+        async def fetch_users(missing: List[int]):
+            result = await self.db_session.execute(
+                select(UserModel).where(UserModel.id.in_(missing))
+            )
+            return {
+                user.id: UserPublic.from_orm(user).dict()
+                for user in result.scalars().all()
+            }
+
+        cached_users = await cache_many(
+            user_ids,
+            lambda user_id: f"user:details:{user_id}",
+            fetch_users,
+            ttl=CACHE_TTL,
+            not_found=lambda user_id: "User not found",
+        )
+
+        with timed_phase("validate"):
+            return UsersBatchPublic(
+                data=[
+                    UserPublic(**cached_users[user_id])
+                    for user_id in user_ids
+                    if user_id in cached_users
+                ],
+                missing=[
+                    user_id for user_id in user_ids if user_id not in cached_users
+                ],
+            )
+
     async def create_user(self, user: UserModel) -> UserModel:
         existing_user = await self._get_user_by_email(user.email)
         if existing_user:
@@ -87,16 +162,22 @@ class UserService:
         await self.db_session.commit()
         await self.db_session.refresh(db_user)
 
-        await invalidate_pattern_cache("users:*")
+        await invalidate_cache(f"user:details:{db_user.id}", namespaces=["users"])
         return db_user
 
-    async def update_user(self, user_id: int, user_update: UserUpdate) -> UserModel:
+    async def update_user(
+        self,
+        user_id: int,
+        user_update: UserUpdate,
+        expected_versions: Optional[Set[int]] = None,
+    ) -> UserModel:
         db_user = await self._get_user_by_id(user_id)
 
         if not db_user:
             raise HTTPException(
                 status_code=HTTPStatus.NOT_FOUND, detail="User not found"
             )
+        check_version(db_user.version, expected_versions)
 
         update_data = user_update.dict(exclude_unset=True)
 
@@ -113,11 +194,10 @@ class UserService:
         for key, value in update_data.items():
             setattr(db_user, key, value)
 
-        await self.db_session.commit()
+        await commit_versioned(self.db_session)
         await self.db_session.refresh(db_user)
 
-        await invalidate_cache(f"user:details:{user_id}")
-        await invalidate_pattern_cache("users:*")
+        await invalidate_cache(f"user:details:{user_id}", namespaces=["users"])
         return db_user
 
     async def delete_user(self, user_id: int) -> None:
@@ -131,8 +211,7 @@ class UserService:
         await self.db_session.delete(db_user)
         await self.db_session.commit()
 
-        await invalidate_cache(f"user:details:{user_id}")
-        await invalidate_pattern_cache("users:*")
+        await invalidate_cache(f"user:details:{user_id}", namespaces=["users"])
 
     def _hash_password(self, password: str) -> str:
         return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
@@ -146,8 +225,10 @@ class UserService:
     async def _get_user_by_id(self, user_id: int) -> Optional[UserModel]:
         return await self.db_session.get(UserModel, user_id)
 
-    def _build_user_query(self, order: str, sort: str, username: Optional[str]):
-        query = select(UserModel)
+    def _build_user_query(
+        self, order: str, sort: str, username: Optional[str], columns: FrozenSet[str]
+    ):
+        query = select(*(getattr(UserModel, column) for column in sorted(columns)))
         if username:
             query = query.where(UserModel.username.ilike(f"%{username}%"))
 
@@ -165,5 +246,8 @@ class UserService:
         return query
 
 
-def get_user_service(db_session: AsyncSession = Depends(get_db)) -> UserService:
-    return UserService(db_session)
+def get_user_service(
+    db_session: AsyncSession = Depends(get_db),
+    read_session: AsyncSession = Depends(get_read_db),
+) -> UserService:
+    return UserService(db_session, read_session)
@@ -0,0 +1,32 @@
+import json
+import os
+import platform
+
+from benchmarks.standins import REPO_ROOT
+
+BASELINE_DIR = os.path.join(REPO_ROOT, "benchmarks", "baselines")
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)["results"]
+
+
+def save_baseline(path: str, results: dict, **settings) -> None:
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {"python": platform.python_version(), **settings, "results": results},
+            baseline_file,
+            indent=2,
+        )
+    print(f"\nbaseline written to {path}")
+
+
+def delta(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
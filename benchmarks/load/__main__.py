@@ -0,0 +1,121 @@
+"""Load-test every app against in-process stand-ins and diff against baselines.
+
+python -m benchmarks.load                       # run and print results
+python -m benchmarks.load --save                # store as the new baseline
+python -m benchmarks.load --compare             # fail on p95/RPS/error regressions
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.baseline import baseline_path, delta, load_baseline, save_baseline
+from benchmarks.standins import REPO_ROOT
+from benchmarks.load.workloads import WORKLOADS
+
+
+def run_app(app_name: str, args) -> dict:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.load.worker",
+        app_name,
+        "--duration",
+        str(args.duration),
+        "--warmup",
+        str(args.warmup),
+        "--concurrency",
+        str(args.concurrency),
+        "--seed",
+        str(args.seed),
+    ]
+    completed = subprocess.run(
+        command, cwd=REPO_ROOT, capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"benchmark worker for {app_name} failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    header = f"{'endpoint':<42}{'req':>8}{'err':>6}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}"
+    for app_name, endpoints in results.items():
+        print(f"\n[{app_name}]")
+        print(header)
+        for label, stats in endpoints.items():
+            line = (
+                f"{label:<42}{stats['requests']:>8}{stats['errors']:>6}"
+                f"{stats['rps']:>10.1f}{stats['p50_ms']:>10.2f}"
+                f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+            )
+            previous = (baseline or {}).get(app_name, {}).get(label)
+            if previous:
+                line += (
+                    f"  p95 {delta(previous['p95_ms'], stats['p95_ms']):>+7.1f}%"
+                    f"  rps {delta(previous['rps'], stats['rps']):>+7.1f}%"
+                )
+            print(line)
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for app_name, endpoints in results.items():
+        for label, stats in endpoints.items():
+            previous = baseline.get(app_name, {}).get(label)
+            if not previous:
+                continue
+            if delta(previous["p95_ms"], stats["p95_ms"]) > threshold:
+                regressions.append(f"{app_name} {label}: p95 regressed")
+            if delta(previous["rps"], stats["rps"]) < -threshold:
+                regressions.append(f"{app_name} {label}: rps regressed")
+            if stats["errors"] > previous.get("errors", 0):
+                regressions.append(
+                    f"{app_name} {label}: errors rose "
+                    f"({previous.get('errors', 0)} -> {stats['errors']})"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--apps", nargs="+", choices=sorted(WORKLOADS))
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--save", action="store_true", help="write the baseline")
+    parser.add_argument("--compare", action="store_true", help="diff the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed regression in %%"
+    )
+    parser.add_argument("--baseline", default=baseline_path("load"))
+    args = parser.parse_args(argv)
+
+    results = {app_name: run_app(app_name, args) for app_name in args.apps or WORKLOADS}
+
+    baseline = load_baseline(args.baseline) if args.compare else None
+
+    print_results(results, baseline)
+
+    if args.save:
+        save_baseline(
+            args.baseline,
+            results,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            seed=args.seed,
+        )
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print("\n" + "\n".join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Boot one app against the stand-ins and replay its workload.
+
+Runs in its own process because every app imports top-level ``main``,
+``routes``, ``schemas`` and ``services`` modules. Prints one JSON document.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.standins import load_app, unload_app
+from benchmarks.load.workloads import WORKLOADS
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1)
+    return sorted_values[max(index, 0)]
+
+
+async def replay(
+    app_name: str, duration: float, warmup: float, concurrency: int, seed: int
+):
+    app = await load_app(app_name)
+    rng = random.Random(seed)
+    operations = await WORKLOADS[app_name](rng)
+    weights = [operation.weight for operation in operations]
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    recording = False
+
+    async def worker(client, deadline):
+        while time.perf_counter() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await operation.run(client)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - start
+            if recording:
+                latencies[operation.label].append(elapsed)
+                if failed:
+                    errors[operation.label] += 1
+
+    # The lifespan starts what runs next to requests in production: the
+    # outbox relay, cache warmers, change-stream and NOTIFY listeners.
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(client, deadline) for _ in range(concurrency)))
+
+        recording = True
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(worker(client, deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await unload_app(app_name)
+
+    results = {}
+    for label, values in sorted(latencies.items()):
+        values.sort()
+        results[label] = {
+            "requests": len(values),
+            "errors": errors[label],
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("app", choices=sorted(WORKLOADS))
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    results = asyncio.run(
+        replay(args.app, args.duration, args.warmup, args.concurrency, args.seed)
+    )
+    sys.stdout.write(json.dumps(results) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Request mixes replayed against each app.
+
+Every workload seeds its stand-in backend, then exposes weighted operations.
+Labels use route templates so results line up with the /metrics histograms.
+"""
+
+import datetime
+import random
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+
+import bcrypt
+
+SEED_ROWS = 200
+BENCH_PASSWORD = "benchmark-password"
+
+
+class Operation(NamedTuple):
+    label: str
+    weight: int
+    run: Callable[..., Awaitable]
+
+
+def _now(rng: random.Random) -> datetime.datetime:
+    return datetime.datetime(2024, 1, 1) + datetime.timedelta(
+        days=rng.randint(0, 365), seconds=rng.randint(0, 86400)
+    )
+
+
+def _trip(rng: random.Random) -> dict:
+    start = _now(rng)
+    return {
+        "name": f"Trip {rng.randint(1, 10_000)}",
+        "destination": {
+            "postal_code": f"{rng.randint(10000, 99999)}",
+            "street": "Main Street",
+            "city": rng.choice(["Lisbon", "Porto", "Curitiba", "Berlin"]),
+            "state": "State",
+            "country": "Country",
+        },
+        "start_date": start.isoformat(),
+        "end_date": (start + datetime.timedelta(days=3)).isoformat(),
+        "cost": round(rng.uniform(100, 5000), 2),
+        "travelers": [f"user{rng.randint(1, 50)}" for _ in range(rng.randint(1, 4))],
+        "observations": {"notes": "x" * rng.randint(0, 512)},
+    }
+
+
+def _expense(rng: random.Random) -> dict:
+    return {
+        "type": rng.choice(["meal", "hotel", "taxi", "flight"]),
+        "amount": round(rng.uniform(5, 900), 2),
+        "incurred_date": _now(rng).isoformat(),
+        "details": {"vendor": "Vendor", "receipt": "r" * rng.randint(0, 512)},
+        "tags": ["business"],
+        "observation": None,
+    }
+
+
+def _expense_type(rng: random.Random) -> dict:
+    return {
+        "name": f"type-{rng.randint(1, 10_000)}",
+        "description": "Expense type",
+        "max_reimbursement": round(rng.uniform(50, 2000), 2),
+        "creator": "benchmark",
+        "observations": {"policy": "p" * rng.randint(0, 256)},
+    }
+
+
+def _seed_mongo(collection, factory, rng: random.Random) -> List[str]:
+    now = datetime.datetime.utcnow()
+    documents = []
+    for _ in range(SEED_ROWS):
+        document = factory(rng)
+        for field in ("start_date", "end_date", "incurred_date"):
+            if field in document:
+                document[field] = datetime.datetime.fromisoformat(document[field])
+        document["created_at"] = now
+        document["updated_at"] = now
+        documents.append(document)
+    result = collection.insert_many(documents)
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+
+async def trips_workload(rng: random.Random) -> List[Operation]:
+    from common.mongo import config
+
+    ids = _seed_mongo(config.client.trips_db["trips"], _trip, rng)
+
+    async def list_trips(client):
+        return await client.get(
+            "/trips/",
+            params={
+                "page": rng.randint(1, 3),
+                "order": rng.choice(["asc", "desc"]),
+                "sort": rng.choice(["name", "created_at"]),
+            },
+        )
+
+    async def get_trip(client):
+        return await client.get(f"/trips/{rng.choice(ids)}")
+
+    async def create_trip(client):
+        response = await client.post("/trips/", json=_trip(rng))
+        if response.status_code == 201:
+            ids.append(response.json()["id"])
+        return response
+
+    return [
+        Operation("GET /trips/", 50, list_trips),
+        Operation("GET /trips/{trip_id}", 40, get_trip),
+        Operation("POST /trips/", 10, create_trip),
+    ]
+
+
+async def expenses_workload(rng: random.Random) -> List[Operation]:
+    from common.mongo import config
+
+    expense_ids = _seed_mongo(config.client.expenses_db["expenses"], _expense, rng)
+    type_ids = _seed_mongo(
+        config.client.expense_types_db["expense_types"], _expense_type, rng
+    )
+
+    async def list_expenses(client):
+        return await client.get(
+            "/expenses/",
+            params={
+                "page": rng.randint(1, 3),
+                "sort": rng.choice(["amount", "incurred_date", "created_at"]),
+            },
+        )
+
+    async def get_expense(client):
+        return await client.get(f"/expenses/{rng.choice(expense_ids)}")
+
+    async def create_expense(client):
+        response = await client.post("/expenses/", json=_expense(rng))
+        if response.status_code == 201:
+            expense_ids.append(response.json()["id"])
+        return response
+
+    async def update_expense(client):
+        return await client.put(
+            f"/expenses/{rng.choice(expense_ids)}", json=_expense(rng)
+        )
+
+    async def list_types(client):
+        return await client.get("/expenses/types/", params={"page": 1})
+
+    async def get_type(client):
+        return await client.get(f"/expenses/types/{rng.choice(type_ids)}")
+
+    return [
+        Operation("GET /expenses/", 35, list_expenses),
+        Operation("GET /expenses/{expense_id}", 30, get_expense),
+        Operation("POST /expenses/", 8, create_expense),
+        Operation("PUT /expenses/{expense_id}", 7, update_expense),
+        Operation("GET /expenses/types/", 10, list_types),
+        Operation("GET /expenses/types/{type_id}", 10, get_type),
+    ]
+
+
+async def users_workload(rng: random.Random) -> List[Operation]:
+    from common.postgres import config
+    from models import UserModel
+
+    password = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt()).decode()
+    async with config.async_session() as session:
+        session.add_all(
+            UserModel(
+                username=f"user{i}",
+                email=f"user{i}@example.com",
+                password=password,
+                level=rng.randint(1, 3),
+            )
+            for i in range(SEED_ROWS)
+        )
+        await session.commit()
+
+    async def list_users(client):
+        return await client.get(
+            "/users/",
+            params={
+                "page": rng.randint(1, 3),
+                "sort": rng.choice(["username", "joined", "level"]),
+            },
+        )
+
+    async def get_user(client):
+        return await client.get(f"/users/{rng.randint(1, SEED_ROWS)}")
+
+    async def update_user(client):
+        return await client.put(
+            f"/users/{rng.randint(1, SEED_ROWS)}",
+            json={"level": rng.randint(1, 3)},
+        )
+
+    async def login(client):
+        return await client.post(
+            "/auth/login",
+            json={
+                "email": f"user{rng.randrange(SEED_ROWS)}@example.com",
+                "password": BENCH_PASSWORD,
+            },
+        )
+
+    return [
+        Operation("GET /users/", 45, list_users),
+        Operation("GET /users/{user_id}", 40, get_user),
+        Operation("PUT /users/{user_id}", 10, update_user),
+        Operation("POST /auth/login", 5, login),
+    ]
+
+
+async def reimbursements_workload(rng: random.Random) -> List[Operation]:
+    from common.postgres import config
+    from models import ReimbursementModel
+
+    async with config.async_session() as session:
+        session.add_all(
+            ReimbursementModel(
+                user_id=rng.randint(1, 50),
+                trip_id=rng.randint(1, 50),
+                status=rng.choice(["Pending", "Approved", "Rejected"]),
+                total_amount=round(rng.uniform(10, 3000), 2),
+            )
+            for _ in range(SEED_ROWS)
+        )
+        await session.commit()
+
+    async def list_reimbursements(client):
+        params = {"page": rng.randint(1, 3)}
+        if rng.random() < 0.5:
+            params["status"] = "Pending"
+        return await client.get("/reimbursements/", params=params)
+
+    async def get_reimbursement(client):
+        return await client.get(f"/reimbursements/{rng.randint(1, SEED_ROWS)}")
+
+    async def submit_reimbursement(client):
+        return await client.post(
+            "/reimbursements/",
+            json={
+                "user_id": rng.randint(1, 50),
+                "trip_id": rng.randint(1, 50),
+                "total_amount": round(rng.uniform(10, 3000), 2),
+                "expense_ids": [rng.randint(1, 500) for _ in range(3)],
+            },
+        )
+
+    return [
+        Operation("GET /reimbursements/", 50, list_reimbursements),
+        Operation("GET /reimbursements/{reimbursement_id}", 35, get_reimbursement),
+        Operation("POST /reimbursements/", 15, submit_reimbursement),
+    ]
+
+
+WORKLOADS: Dict[str, Callable[[random.Random], Awaitable[List[Operation]]]] = {
+    "users": users_workload,
+    "trips": trips_workload,
+    "expenses": expenses_workload,
+    "reimbursements": reimbursements_workload,
+}
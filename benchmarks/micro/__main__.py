@@ -0,0 +1,89 @@
+"""Micro-benchmarks for the cache, serialization, pagination and response helpers.
+
+python -m benchmarks.micro                       # run every suite
+python -m benchmarks.micro --suites cache        # run one suite
+python -m benchmarks.micro --save | --compare    # store or diff baseline
+"""
+
+import argparse
+import asyncio
+import logging
+
+from benchmarks.baseline import baseline_path, delta, load_baseline, save_baseline
+from benchmarks.micro import (
+    bench_cache,
+    bench_pagination,
+    bench_responses,
+    bench_serialization,
+)
+from benchmarks.standins import use_app
+
+SUITES = {
+    "cache": bench_cache.run,
+    "serialization": bench_serialization.run,
+    "pagination": bench_pagination.run,
+    "responses": bench_responses.run,
+}
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    header = f"{'case':<52}{'ops/s':>12}{'us/op':>10}{'peak KiB':>10}{'kept B':>9}"
+    for suite, cases in results.items():
+        print(f"\n[{suite}]")
+        print(header)
+        for case, stats in cases.items():
+            line = (
+                f"{case:<52}{stats['ops_per_sec']:>12.1f}{stats['us_per_op']:>10.2f}"
+                f"{stats['alloc_peak_kib']:>10.2f}{stats['alloc_retained_b']:>9}"
+            )
+            previous = (baseline or {}).get(suite, {}).get(case)
+            if previous:
+                change = delta(previous["ops_per_sec"], stats["ops_per_sec"])
+                line += f"  ops {change:>+7.1f}%"
+            print(line)
+
+
+async def run_suites(names) -> dict:
+    # Sets the benchmark env so common.postgres and common.mongo import cleanly.
+    use_app("users")
+    return {name: await SUITES[name]() for name in names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--suites", nargs="+", choices=sorted(SUITES))
+    parser.add_argument("--save", action="store_true", help="write the baseline")
+    parser.add_argument("--compare", action="store_true", help="diff the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="allowed regression in %%"
+    )
+    parser.add_argument("--baseline", default=baseline_path("micro"))
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    results = asyncio.run(run_suites(args.suites or list(SUITES)))
+
+    baseline = load_baseline(args.baseline) if args.compare else None
+    print_results(results, baseline)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+
+    if baseline is not None:
+        regressions = [
+            f"{suite} {case}: ops/s regressed"
+            for suite, cases in results.items()
+            for case, stats in cases.items()
+            if case in baseline.get(suite, {})
+            and delta(baseline[suite][case]["ops_per_sec"], stats["ops_per_sec"])
+            < -args.threshold
+        ]
+        if regressions:
+            print("\n" + "\n".join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import itertools
+import random
+
+import orjson
+
+from benchmarks.micro.harness import measure
+from benchmarks.micro.payloads import PAGE_SIZE, expense_document
+from benchmarks.standins import install_redis
+
+
+def _page_payload() -> dict:
+    rng = random.Random(1)
+    data = []
+    for _ in range(PAGE_SIZE):
+        document = expense_document(rng)
+        document["id"] = str(document.pop("_id"))
+        data.append(document)
+    return orjson.loads(orjson.dumps({"data": data, "page": 1, "next": 2}))
+
+
+async def run() -> dict:
+    from common import redis as cache
+
+    install_redis()
+    payload = _page_payload()
+    counter = itertools.count()
+
+    async def fetcher():
+        return payload
+
+    await cache.cache_with_expiry("bench:expiry", fetcher)
+    await cache.cache_with_sliding_expiry("bench:sliding", fetcher)
+    await cache.cache_with_access_limit("bench:limit", fetcher, max_accesses=10**9)
+
+    async def expiry_hit():
+        await cache.cache_with_expiry("bench:expiry", fetcher)
+
+    async def expiry_miss():
+        await cache.cache_with_expiry(f"bench:miss:{next(counter)}", fetcher, ttl=5)
+
+    async def sliding_hit():
+        await cache.cache_with_sliding_expiry("bench:sliding", fetcher)
+
+    async def access_limit_hit():
+        await cache.cache_with_access_limit("bench:limit", fetcher, max_accesses=10**9)
+
+    async def access_limit_evicting():
+        await cache.cache_with_access_limit("bench:evict", fetcher, max_accesses=2)
+
+    return {
+        "cache_with_expiry[hit]": await measure(expiry_hit),
+        "cache_with_expiry[miss]": await measure(expiry_miss),
+        "cache_with_sliding_expiry[hit]": await measure(sliding_hit),
+        "cache_with_access_limit[hit]": await measure(access_limit_hit),
+        "cache_with_access_limit[evicting]": await measure(access_limit_evicting),
+    }
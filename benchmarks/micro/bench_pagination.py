@@ -0,0 +1,89 @@
+import random
+
+from sqlalchemy import Float, Integer, String, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Mapped, declarative_base, mapped_column
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.micro.harness import measure
+
+TABLE_SIZES = (1_000, 10_000, 100_000)
+PAGE_SIZE = 26
+
+Base = declarative_base()
+
+
+class BenchRow(Base):
+    __tablename__ = "bench_rows"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(String(50))
+    total_amount: Mapped[float] = mapped_column(Float)
+
+
+async def _seed(engine, size: int) -> None:
+    rng = random.Random(size)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        rows = [
+            {
+                "status": rng.choice(["Pending", "Approved", "Rejected"]),
+                "total_amount": rng.uniform(10, 3000),
+            }
+            for _ in range(size)
+        ]
+        await conn.execute(insert(BenchRow), rows)
+
+
+async def run() -> dict:
+    from common.postgres import cursor_paginate_query, paginate_query
+
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    results = {}
+    query = select(BenchRow)
+    try:
+        for size in TABLE_SIZES:
+            await _seed(engine, size)
+            deep_page = size // PAGE_SIZE // 2
+            deep_cursor = (deep_page - 1) * PAGE_SIZE
+
+            async with AsyncSession(engine) as session:
+
+                async def offset_first():
+                    await paginate_query(
+                        session, query.order_by(BenchRow.id), 1, PAGE_SIZE
+                    )
+
+                async def offset_deep():
+                    await paginate_query(
+                        session, query.order_by(BenchRow.id), deep_page, PAGE_SIZE
+                    )
+
+                async def cursor_first():
+                    await cursor_paginate_query(session, query, PAGE_SIZE)
+
+                async def cursor_deep():
+                    await cursor_paginate_query(
+                        session, query, PAGE_SIZE, cursor=deep_cursor
+                    )
+
+                results[f"paginate_query[first,rows={size}]"] = await measure(
+                    offset_first
+                )
+                results[f"paginate_query[deep,rows={size}]"] = await measure(
+                    offset_deep
+                )
+                results[f"cursor_paginate_query[first,rows={size}]"] = await measure(
+                    cursor_first
+                )
+                results[f"cursor_paginate_query[deep,rows={size}]"] = await measure(
+                    cursor_deep
+                )
+    finally:
+        await engine.dispose()
+    return results
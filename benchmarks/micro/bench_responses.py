@@ -0,0 +1,106 @@
+import random
+
+from fastapi import APIRouter, FastAPI
+
+from benchmarks.micro.harness import measure
+from benchmarks.micro.payloads import PAGE_SIZE, expense_document, user_row
+from benchmarks.standins import use_app
+
+
+def _app(page, route_class=None, response_class=None, response_model=None):
+    from common.metrics import TimedJSONResponse
+
+    router = APIRouter(**({"route_class": route_class} if route_class else {}))
+
+    @router.get("/", response_model=response_model)
+    async def read_page():
+        return page
+
+    app = FastAPI(default_response_class=response_class or TimedJSONResponse)
+    app.include_router(router)
+    return app
+
+
+def _request(app):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("bench", 80),
+        "client": ("bench", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    async def request():
+        await app(scope, receive, send)
+
+    return request
+
+
+async def _bench_page(page, page_model) -> dict:
+    """The list routes declare no response_model (items are partial models);
+    detail-style routes declare one, so both stock paths are measured."""
+    from common.app import ModelResponseRoute
+    from common.metrics import TimedORJSONResponse
+
+    return {
+        "stock": await measure(_request(_app(page))),
+        "stock_response_model": await measure(
+            _request(_app(page, response_model=page_model))
+        ),
+        "model_route_orjson": await measure(
+            _request(
+                _app(
+                    page,
+                    route_class=ModelResponseRoute,
+                    response_class=TimedORJSONResponse,
+                    response_model=page_model,
+                )
+            )
+        ),
+    }
+
+
+async def run() -> dict:
+    rng = random.Random(1)
+    results = {}
+
+    use_app("expenses")
+    from schemas import ExpensePublic, ExpensesPublic
+    from services import ExpenseService
+
+    service = ExpenseService(ExpenseService._get_collection())
+    expenses = ExpensesPublic(
+        data=[
+            ExpensePublic(**service._format_expense(expense_document(rng)))
+            for _ in range(PAGE_SIZE)
+        ],
+        page=1,
+        next=2,
+    )
+    for case, stats in (await _bench_page(expenses, ExpensesPublic)).items():
+        results[f"GET /expenses/ {case}"] = stats
+
+    use_app("users")
+    from schemas import UserPublic, UsersPublic
+
+    users = UsersPublic(
+        data=[UserPublic(**user_row(rng)) for _ in range(PAGE_SIZE)], page=1, next=2
+    )
+    for case, stats in (await _bench_page(users, UsersPublic)).items():
+        results[f"GET /users/ {case}"] = stats
+
+    return results
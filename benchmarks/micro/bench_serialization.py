@@ -0,0 +1,97 @@
+import random
+
+from benchmarks.micro.harness import measure
+from benchmarks.micro.payloads import (
+    PAGE_SIZE,
+    expense_document,
+    expense_type_document,
+    trip_document,
+)
+from benchmarks.standins import use_app
+
+
+async def _bench_format(format_document, model, list_model, documents) -> dict:
+    def format_only():
+        for document in documents:
+            format_document(dict(document))
+
+    formatted = [format_document(dict(document)) for document in documents]
+
+    def validate_page():
+        list_model(data=[model(**item) for item in formatted], page=1, next=2)
+
+    from common.redis.codec import encode, decode
+
+    cached = encode(
+        {"data": [model(**item).dict() for item in formatted], "page": 1, "next": 2}
+    )
+
+    def cache_round_trip():
+        page = decode(cached)
+        list_model(
+            data=[model(**item) for item in page["data"]],
+            page=page["page"],
+            next=page.get("next"),
+        )
+
+    def fetch_round_trip():
+        items = [model(**format_document(dict(document))) for document in documents]
+        encode({"data": [item.dict() for item in items], "page": 1, "next": 2})
+
+    return {
+        "format": await measure(format_only),
+        "validate_page": await measure(validate_page),
+        "cache_hit_round_trip": await measure(cache_round_trip),
+        "fetch_round_trip": await measure(fetch_round_trip),
+    }
+
+
+async def run() -> dict:
+    rng = random.Random(1)
+    results = {}
+
+    use_app("expenses")
+    from schemas import ExpensePublic, ExpensesPublic
+    from schemas import ExpenseTypePublic, ExpenseTypesPublic
+    from services import ExpenseService, ExpenseTypeService
+
+    expenses = [expense_document(rng) for _ in range(PAGE_SIZE)]
+    for case, stats in (
+        await _bench_format(
+            ExpenseService(ExpenseService._get_collection())._format_expense,
+            ExpensePublic,
+            ExpensesPublic,
+            expenses,
+        )
+    ).items():
+        results[f"_format_expense/{case}"] = stats
+
+    expense_types = [expense_type_document(rng) for _ in range(PAGE_SIZE)]
+    for case, stats in (
+        await _bench_format(
+            ExpenseTypeService(
+                ExpenseTypeService._get_collection()
+            )._format_expense_type,
+            ExpenseTypePublic,
+            ExpenseTypesPublic,
+            expense_types,
+        )
+    ).items():
+        results[f"_format_expense_type/{case}"] = stats
+
+    use_app("trips")
+    from schemas import TripPublic, TripsPublic
+    from services import TripService
+
+    trips = [trip_document(rng) for _ in range(PAGE_SIZE)]
+    for case, stats in (
+        await _bench_format(
+            TripService(TripService._get_collection())._format_trip,
+            TripPublic,
+            TripsPublic,
+            trips,
+        )
+    ).items():
+        results[f"_format_trip/{case}"] = stats
+
+    return results
@@ -0,0 +1,56 @@
+import inspect
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, Union
+
+MIN_TIME = 0.5
+ALLOCATION_SAMPLES = 25
+
+Operation = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+async def measure(op: Operation, min_time: float = MIN_TIME) -> Dict[str, float]:
+    """Report throughput and per-call allocations of ``op``.
+
+    Allocations are sampled one call at a time with tracemalloc restarted in
+    between, so ``alloc_peak_kib`` is the transient high-water mark of a single
+    call and ``alloc_retained_b`` is what it left behind.
+    """
+    is_async = inspect.iscoroutinefunction(op)
+
+    async def call():
+        if is_async:
+            await op()
+        else:
+            op()
+
+    await call()
+
+    batch = 1
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            await call()
+        iterations += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        batch = min(batch * 2, 1024)
+
+    peaks = []
+    retained = []
+    for _ in range(ALLOCATION_SAMPLES):
+        tracemalloc.start()
+        await call()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+        retained.append(current)
+
+    return {
+        "ops_per_sec": round(iterations / elapsed, 1),
+        "us_per_op": round(elapsed / iterations * 1_000_000, 2),
+        "alloc_peak_kib": round(sum(peaks) / len(peaks) / 1024, 2),
+        "alloc_retained_b": round(sum(retained) / len(retained)),
+    }
@@ -0,0 +1,70 @@
+import datetime
+import random
+
+import bson
+
+PAGE_SIZE = 25
+
+
+def expense_document(rng: random.Random) -> dict:
+    now = datetime.datetime(2024, 6, 1, 12, 0, 0)
+    return {
+        "_id": bson.ObjectId(),
+        "type": rng.choice(["meal", "hotel", "taxi", "flight"]),
+        "amount": round(rng.uniform(5, 900), 2),
+        "incurred_date": now,
+        "details": {"vendor": "Vendor", "receipt": "r" * 256, "items": [1, 2, 3]},
+        "tags": ["business", "q2"],
+        "observation": "Client dinner",
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def expense_type_document(rng: random.Random) -> dict:
+    now = datetime.datetime(2024, 6, 1, 12, 0, 0)
+    return {
+        "_id": bson.ObjectId(),
+        "name": f"type-{rng.randint(1, 10_000)}",
+        "description": "Expense type",
+        "max_reimbursement": round(rng.uniform(50, 2000), 2),
+        "creator": "benchmark",
+        "observations": {"policy": "p" * 256},
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def trip_document(rng: random.Random) -> dict:
+    now = datetime.datetime(2024, 6, 1, 12, 0, 0)
+    return {
+        "_id": bson.ObjectId(),
+        "name": f"Trip {rng.randint(1, 10_000)}",
+        "destination": {
+            "postal_code": "80000",
+            "street": "Main Street",
+            "city": "Curitiba",
+            "state": "PR",
+            "country": "Brazil",
+        },
+        "start_date": now,
+        "end_date": now + datetime.timedelta(days=3),
+        "cost": round(rng.uniform(100, 5000), 2),
+        "travelers": ["ana", "bruno", "carla"],
+        "observations": {"notes": "n" * 256},
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def user_row(rng: random.Random) -> dict:
+    user_id = rng.randint(1, 100_000)
+    return {
+        "id": user_id,
+        "username": f"user{user_id}",
+        "email": f"user{user_id}@example.com",
+        "level": rng.randint(1, 3),
+        "joined": datetime.datetime(2024, 6, 1, 12, 0, 0),
+        "is_active": True,
+        "version": 1,
+    }
@@ -0,0 +1,190 @@
+"""In-process stand-ins for Redis, Mongo, Postgres and RabbitMQ.
+
+The apps create their clients at import time, so the stand-ins are swapped in
+after ``main`` has been imported by replacing every module attribute that still
+points at the real client.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_ENV = {
+    "SECRET_KEY": "benchmark-secret-key-at-least-32-bytes",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "DB_USER": "bench",
+    "DB_PASSWORD": "bench",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "bench",
+    "MONGO_URL": "mongodb://localhost:27017",
+    "SERVER_TIMING_SAMPLE_RATE": "0",
+}
+
+POSTGRES_APPS = {"users", "reimbursements"}
+MONGO_APPS = {"trips", "expenses"}
+APP_MODULES = ("main", "routes", "schemas", "services", "models")
+
+
+def use_app(app_name: str) -> None:
+    """Make ``app_name``'s top-level packages importable, dropping any other app's."""
+    for key, value in BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    for name in list(sys.modules):
+        if name.split(".", 1)[0] in APP_MODULES:
+            del sys.modules[name]
+
+    app_dir = os.path.join(REPO_ROOT, "apps", app_name)
+    sys.path[:] = [
+        path
+        for path in sys.path
+        if not path.startswith(os.path.join(REPO_ROOT, "apps"))
+    ]
+    sys.path[:0] = [app_dir, REPO_ROOT]
+
+
+async def load_app(app_name: str):
+    use_app(app_name)
+
+    import main
+
+    install_redis()
+    install_rabbitmq()
+    if app_name in MONGO_APPS:
+        install_mongo()
+    if app_name in POSTGRES_APPS:
+        await install_postgres()
+    return main.app
+
+
+async def unload_app(app_name: str) -> None:
+    if app_name in POSTGRES_APPS:
+        from common.postgres import config
+
+        await config.engine.dispose()
+        shutil.rmtree(os.path.dirname(config.engine.url.database), ignore_errors=True)
+
+
+def replace_everywhere(original, replacement) -> None:
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not namespace:
+            continue
+        for name, value in list(namespace.items()):
+            if value is original:
+                setattr(module, name, replacement)
+
+
+def install_redis():
+    import fakeredis
+    from common.redis import config
+
+    original = config.redis_client
+    decode = original.connection_pool.connection_kwargs.get("decode_responses")
+    fake = fakeredis.aioredis.FakeRedis(decode_responses=decode)
+    replace_everywhere(original, fake)
+
+    # Lua scripts are registered against the real client at import time.
+    from aioredis.client import Script
+
+    for module in list(sys.modules.values()):
+        for name, value in list(getattr(module, "__dict__", {}).items()):
+            if isinstance(value, Script) and value.registered_client is original:
+                setattr(module, name, fake.register_script(value.script))
+    return fake
+
+
+def install_mongo():
+    import mongomock
+    from common.mongo import config
+
+    # Services use pymongo>=4.9 Cursor.to_list, which mongomock lacks.
+    if not hasattr(mongomock.collection.Cursor, "to_list"):
+        mongomock.collection.Cursor.to_list = lambda self, length=None: list(self)[
+            :length
+        ]
+
+    fake = mongomock.MongoClient()
+    replace_everywhere(config.client, fake)
+    return fake
+
+
+async def install_postgres():
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+    from common.postgres import config
+    from models import Base
+
+    # A file, not :memory:, so every session gets its own connection; a
+    # shared one lets the outbox relay and requests trample each other's
+    # cursors.
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"timeout": 30},
+        poolclass=NullPool,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    replace_everywhere(config.engine, engine)
+    replace_everywhere(
+        config.async_session,
+        sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    return engine
+
+
+class InMemoryChannel:
+    published = defaultdict(list)
+    is_closed = False
+
+    def queue_declare(self, queue, durable=False, **kwargs):
+        self.published.setdefault(queue, [])
+
+    def confirm_delivery(self):
+        pass
+
+    def basic_publish(
+        self, exchange, routing_key, body, properties=None, mandatory=False
+    ):
+        self.published[routing_key].append(body)
+
+    def close(self):
+        pass
+
+
+class InMemoryConnection:
+    def __init__(self, params=None):
+        self.is_open = True
+
+    def channel(self):
+        return InMemoryChannel()
+
+    def process_data_events(self, time_limit=None):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+def install_rabbitmq():
+    import pika
+
+    pika.BlockingConnection = InMemoryConnection
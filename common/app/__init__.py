@@ -0,0 +1,4 @@
+from .routing import *
+from .resources import *
+from .health import *
+from .factory import *
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from fastapi import APIRouter, FastAPI
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.openapi.utils import get_openapi
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from common.metrics import setup_metrics, setup_server_timing, TimedORJSONResponse
+from common.profiling import setup_profiler
+from common.redis import IdempotencyMiddleware
+from .health import setup_health
+from .resources import Resource
+
+__all__ = ["create_app"]
+
+APP_STARTUP_TIMEOUT = float(os.getenv("APP_STARTUP_TIMEOUT", 60))
+APP_STARTUP_RETRY_INTERVAL = float(os.getenv("APP_STARTUP_RETRY_INTERVAL", 1))
+# Seconds between SIGTERM and the server starting its shutdown, during which
+# /health/ready fails but requests are still served.
+APP_DRAIN_DELAY = float(os.getenv("APP_DRAIN_DELAY", 5))
+
+logger = logging.getLogger("app")
+
+security_scheme = {
+    "bearerAuth": {
+        "type": "http",
+        "scheme": "bearer",
+        "bearerFormat": "JWT",
+    }
+}
+
+
+def create_app(
+    name: str,
+    title: str,
+    description: str,
+    tags_metadata: List[Dict[str, Any]],
+    routers: Sequence[Tuple[APIRouter, str, List[str]]],
+    resources: Sequence[Resource] = (),
+    tasks: Sequence[Callable[[], Awaitable[Any]]] = (),
+    lifespan: Optional[Callable[[FastAPI], AsyncContextManager]] = None,
+    idempotency: bool = False,
+) -> FastAPI:
+    """Builds a service app with the shared docs, security, metrics, profiler
+    and health check setup.
+
+    Startup connects and checks every required resource (retrying for up to
+    APP_STARTUP_TIMEOUT), builds the OpenAPI schema, enters lifespan and
+    starts tasks. SIGTERM stops reporting ready and hands the signal on to
+    the server APP_DRAIN_DELAY later. The server then closes its listeners
+    and waits for open requests (bounded by --timeout-graceful-shutdown)
+    before shutdown cancels tasks, exits lifespan and closes the resources.
+    If startup fails, the resources are closed before the error is raised.
+    """
+
+    @asynccontextmanager
+    async def app_lifespan(app: FastAPI):
+        try:
+            # Every start runs to completion before a failure is raised, so
+            # none is still connecting while the resources are closed.
+            results = await asyncio.gather(
+                *(_start(resource) for resource in resources if resource.required),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            app.openapi()
+            async with AsyncExitStack() as stack:
+                if lifespan:
+                    await stack.enter_async_context(lifespan(app))
+                running = [asyncio.create_task(task()) for task in tasks]
+                app.state.ready = True
+                restore = _delay_shutdown_signal(app)
+                try:
+                    yield
+                finally:
+                    restore()
+                    app.state.ready = False
+                    for task in running:
+                        task.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+        finally:
+            for resource in reversed(resources):
+                await _close(resource)
+
+    app = FastAPI(
+        title=title,
+        description=description,
+        version="1.0.0",
+        openapi_tags=tags_metadata,
+        default_response_class=TimedORJSONResponse,
+        lifespan=app_lifespan,
+        license_info={
+            "name": "Apache 2.0",
+            "identifier": "MIT",
+        },
+    )
+    app.state.ready = False
+    app.state.resources = list(resources)
+
+    if idempotency:
+        app.add_middleware(IdempotencyMiddleware)
+    setup_metrics(app)
+    setup_server_timing(app)
+
+    for router, prefix, tags in routers:
+        app.include_router(router, prefix=prefix, tags=tags)
+    setup_profiler(app)
+    setup_health(app, resources)
+
+    def custom_openapi():
+        if app.openapi_schema:
+            return app.openapi_schema
+        openapi_schema = get_openapi(
+            title=app.title,
+            version=app.version,
+            routes=app.routes,
+            openapi_version=app.openapi_version,
+            description=app.description,
+            license_info=app.license_info,
+            tags=app.openapi_tags,
+        )
+        openapi_schema["components"]["securitySchemes"] = security_scheme
+        openapi_schema["security"] = [{"bearerAuth": []}]
+        app.openapi_schema = openapi_schema
+        return app.openapi_schema
+
+    app.openapi = custom_openapi
+    openapi_url = f"/api-{name}/openapi.json"
+
+    @app.get(openapi_url, include_in_schema=False)
+    async def get_openapi_schema():
+        return custom_openapi()
+
+    @app.get(f"/{name}-docs", include_in_schema=False)
+    async def redoc_html():
+        return get_redoc_html(openapi_url=openapi_url, title=app.title)
+
+    @app.get(f"/{name}-swagger", include_in_schema=False)
+    async def swagger_html():
+        return get_swagger_ui_html(openapi_url=openapi_url, title=app.title)
+
+    return app
+
+
+async def _start(resource: Resource):
+    deadline = time.monotonic() + APP_STARTUP_TIMEOUT
+    while True:
+        try:
+            if resource.connect:
+                await resource.connect()
+            await resource.check()
+            logger.info("%s is ready", resource.name)
+            return
+        except Exception as exc:
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"{resource.name} is unavailable") from exc
+            logger.warning("%s is not ready yet: %r", resource.name, exc)
+            await asyncio.sleep(APP_STARTUP_RETRY_INTERVAL)
+
+
+def _delay_shutdown_signal(app: FastAPI) -> Callable[[], None]:
+    """Wraps the server's SIGTERM handler so readiness fails first and the
+    server only stops accepting requests APP_DRAIN_DELAY later, giving load
+    balancers time to stop routing here. A second SIGTERM is passed on at
+    once. Returns a function that puts the server's handler back."""
+    # Signal handlers can only be set from the main thread, and only a
+    # handler the server installed (not SIG_DFL) can be deferred to.
+    previous = signal.getsignal(signal.SIGTERM)
+    if (
+        not APP_DRAIN_DELAY
+        or not callable(previous)
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        return lambda: None
+
+    loop = asyncio.get_running_loop()
+
+    def handle(signum, frame):
+        if not app.state.ready:
+            previous(signum, frame)
+            return
+        app.state.ready = False
+        logger.info("draining for %ss before shutting down", APP_DRAIN_DELAY)
+        loop.call_soon_threadsafe(
+            loop.call_later, APP_DRAIN_DELAY, previous, signum, None
+        )
+
+    signal.signal(signal.SIGTERM, handle)
+
+    def restore():
+        if signal.getsignal(signal.SIGTERM) is handle:
+            signal.signal(signal.SIGTERM, previous)
+
+    return restore
+
+
+async def _close(resource: Resource):
+    if not resource.close:
+        return
+    try:
+        await resource.close()
+    except Exception:
+        logger.exception("closing %s failed", resource.name)
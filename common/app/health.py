@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from http import HTTPStatus
+from fastapi import FastAPI, Request
+from typing import Any, Dict, Optional, Sequence
+from common.metrics import TimedORJSONResponse
+from .resources import Resource
+
+__all__ = ["ReadinessProbe", "setup_health"]
+
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", 2))
+# Probes arriving within this window share one round of dependency checks.
+HEALTH_CACHE_SECONDS = float(os.getenv("HEALTH_CACHE_SECONDS", 1))
+
+
+class ReadinessProbe:
+    """Checks every resource concurrently, each bounded by
+    HEALTH_CHECK_TIMEOUT, and reports per-dependency status and latency.
+    Only required resources decide whether the app is ready."""
+
+    def __init__(self, resources: Sequence[Resource]):
+        self.resources = resources
+        self._report: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def report(self) -> Dict[str, Any]:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= HEALTH_CACHE_SECONDS:
+                checks = await asyncio.gather(
+                    *(self._check(resource) for resource in self.resources)
+                )
+                self._report = {
+                    "status": (
+                        "ready"
+                        if all(
+                            check["status"] == "ok"
+                            for resource, check in zip(self.resources, checks)
+                            if resource.required
+                        )
+                        else "unavailable"
+                    ),
+                    "checks": {
+                        resource.name: check
+                        for resource, check in zip(self.resources, checks)
+                    },
+                }
+                self._checked_at = time.monotonic()
+        return self._report
+
+    @staticmethod
+    async def _check(resource: Resource) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(resource.check(), timeout=HEALTH_CHECK_TIMEOUT)
+            result = {"status": "ok"}
+        except asyncio.TimeoutError:
+            result = {"status": "timeout"}
+        except Exception as exc:
+            # Only the type: messages can carry hosts and credentials.
+            result = {"status": "error", "error": type(exc).__name__}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if not resource.required:
+            result["required"] = False
+        return result
+
+
+def setup_health(app: FastAPI, resources: Sequence[Resource]) -> None:
+    probe = ReadinessProbe(resources)
+
+    @app.get("/health/live", include_in_schema=False)
+    async def live():
+        return {"status": "alive"}
+
+    @app.get("/health/ready", include_in_schema=False)
+    async def ready(request: Request):
+        # uvicorn serves nothing before startup completes, so this is only
+        # false once SIGTERM has arrived and the app is draining.
+        if not request.app.state.ready:
+            return TimedORJSONResponse(
+                {"status": "draining", "checks": {}},
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            )
+
+        report = await probe.report()
+        status_code = (
+            HTTPStatus.OK
+            if report["status"] == "ready"
+            else HTTPStatus.SERVICE_UNAVAILABLE
+        )
+        return TimedORJSONResponse(report, status_code=status_code)
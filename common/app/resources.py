@@ -0,0 +1,121 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+__all__ = [
+    "Resource",
+    "redis_resource",
+    "postgres_resource",
+    "mongo_resource",
+    "rabbitmq_resource",
+]
+
+Hook = Callable[[], Awaitable[None]]
+
+
+class Resource:
+    """A dependency the app needs before it can serve: connected and checked
+    at startup, probed for readiness, and closed on shutdown. check raises
+    when the dependency is unusable.
+
+    A resource that is not required is left alone at startup and its check
+    is reported without failing readiness, for dependencies the app can work
+    without for a while."""
+
+    def __init__(
+        self,
+        name: str,
+        check: Hook,
+        connect: Optional[Hook] = None,
+        close: Optional[Hook] = None,
+        required: bool = True,
+    ):
+        self.name = name
+        self.check = check
+        self.connect = connect
+        self.close = close
+        self.required = required
+
+
+# The clients are looked up on their config modules at call time, so
+# replacing them (as the benchmark stand-ins do) is picked up here.
+
+
+def redis_resource() -> Resource:
+    from common.redis import config
+
+    async def check():
+        await config.redis_client.ping()
+
+    async def close():
+        await config.redis_client.close()
+        await config.redis_client.connection_pool.disconnect()
+
+    return Resource("redis", check=check, close=close)
+
+
+def postgres_resource() -> Resource:
+    from sqlalchemy import text
+    from common.postgres import config, replicas
+
+    async def check():
+        async with config.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    async def close():
+        for replica in replicas:
+            await replica.engine.dispose()
+        await config.engine.dispose()
+
+    return Resource("postgres", check=check, close=close)
+
+
+def mongo_resource() -> Resource:
+    import pymongo
+    from common.mongo import config
+    from .health import HEALTH_CHECK_TIMEOUT
+
+    def ping():
+        # Cancelling the awaiting coroutine doesn't stop the executor thread,
+        # so the ping itself, server selection included, is bounded too;
+        # otherwise each probe during an outage parks a thread for up to
+        # pymongo's 30s server selection timeout.
+        with pymongo.timeout(HEALTH_CHECK_TIMEOUT):
+            config.client.admin.command("ping")
+
+    async def check():
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, ping)
+
+    async def close():
+        config.client.close()
+
+    return Resource("mongo", check=check, close=close)
+
+
+def rabbitmq_resource(connection, required: bool = True) -> Resource:
+    """connection is a RabbitMQConnection shared with its publisher. When
+    not required, the publisher is expected to connect it and keep it
+    serviced, as the outbox relay does."""
+
+    async def connect():
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, connection.connect)
+
+    async def check():
+        # pika connections are not thread-safe, so this only looks at state
+        # instead of sending a heartbeat from this thread; the state is only
+        # as fresh as the publisher's last use of the connection.
+        if not connection.is_open():
+            raise ConnectionError(f"{connection.queue} connection is closed")
+
+    async def close():
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, connection.close)
+
+    return Resource(
+        f"rabbitmq:{connection.queue}",
+        check=check,
+        connect=connect,
+        close=close,
+        required=required,
+    )
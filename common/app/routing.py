@@ -0,0 +1,95 @@
+import functools
+import inspect
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pydantic_core import to_json
+from typing import Any, Callable
+from common.metrics import timed_phase
+
+__all__ = ["ModelResponseRoute"]
+
+_RESPONSE_PARAM = "_model_route_response"
+
+
+class ModelResponseRoute(APIRoute):
+    """Writes a returned model straight to JSON with pydantic-core when it is
+    exactly the declared response_model, or no model is declared, instead of
+    dumping, re-validating and re-encoding it. Anything else, including a
+    subclass of the response model, takes FastAPI's usual path, so the model
+    still filters what goes out."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, self._wrap(endpoint), **kwargs)
+
+    def _wrap(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(endpoint)
+        parameters = list(signature.parameters.values())
+        if not inspect.iscoroutinefunction(endpoint) or any(
+            parameter.kind == parameter.VAR_KEYWORD for parameter in parameters
+        ):
+            return endpoint
+
+        # Headers and cookies set on the injected Response (ETag, the read
+        # stickiness cookie) are only copied by FastAPI onto responses it
+        # builds itself, so the endpoint's one is requested here too.
+        response_param = next(
+            (
+                parameter.name
+                for parameter in parameters
+                if inspect.isclass(parameter.annotation)
+                and issubclass(parameter.annotation, Response)
+            ),
+            None,
+        )
+        injected = response_param is None
+        if injected:
+            response_param = _RESPONSE_PARAM
+            parameters.append(
+                inspect.Parameter(
+                    _RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+                )
+            )
+
+        @functools.wraps(endpoint)
+        async def render_model(**values):
+            sub_response = (
+                values.pop(response_param) if injected else values[response_param]
+            )
+            content = await endpoint(**values)
+            if not self._renders(content):
+                return content
+
+            with timed_phase("render"):
+                body = to_json(content, by_alias=self.response_model_by_alias)
+            response = Response(
+                body,
+                status_code=sub_response.status_code or self.status_code or 200,
+                media_type=self._media_type(),
+            )
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        render_model.__signature__ = signature.replace(parameters=parameters)
+        return render_model
+
+    def _renders(self, content: Any) -> bool:
+        return (
+            isinstance(content, BaseModel)
+            and (self.response_model is None or type(content) is self.response_model)
+            and self._media_type() == "application/json"
+            and not (
+                self.response_model_include
+                or self.response_model_exclude
+                or self.response_model_exclude_unset
+                or self.response_model_exclude_defaults
+                or self.response_model_exclude_none
+            )
+        )
+
+    def _media_type(self) -> str:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        return response_class.media_type
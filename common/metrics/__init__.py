@@ -0,0 +1,3 @@
+from .config import *
+from .middleware import *
+from .timing import *
@@ -0,0 +1,46 @@
+import os
+from prometheus_client import Counter, Gauge, Histogram
+
+METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["method"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Postgres statement execution time.",
+    ["operation"],
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Postgres pool connections by state (size, checked_out, idle, overflow).",
+    ["engine", "state"],
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds",
+    "Mongo command execution time.",
+    ["database", "command", "outcome"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by key namespace and result (hit or miss).",
+    ["namespace", "result"],
+)
+
+RABBITMQ_PUBLISH_DURATION = Histogram(
+    "rabbitmq_publish_duration_seconds",
+    "RabbitMQ basic_publish latency.",
+    ["routing_key"],
+)
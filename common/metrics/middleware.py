@@ -0,0 +1,50 @@
+import time
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from .config import METRICS_PATH, REQUEST_LATENCY, REQUESTS_IN_FLIGHT
+
+
+class PrometheusMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            REQUEST_LATENCY.labels(
+                method, _route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def _route_template(scope) -> str:
+    # The router stores the matched route in the scope, so the label is the
+    # template ("/trips/{trip_id}") rather than the raw path.
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+async def metrics(request: Request) -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+def setup_metrics(app: FastAPI) -> None:
+    app.add_middleware(PrometheusMiddleware)
+    app.add_route(METRICS_PATH, metrics, include_in_schema=False)
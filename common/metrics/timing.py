@@ -0,0 +1,106 @@
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.datastructures import MutableHeaders
+
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", 0.05))
+
+logger = logging.getLogger("server_timing")
+
+_request_phases: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_phases", default=None
+)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    phases = _request_phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_phase(name: str):
+    if _request_phases.get() is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+class TimedJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        with timed_phase("render"):
+            return super().render(content)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        with timed_phase("render"):
+            return super().render(content)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app, sample_rate: float = SERVER_TIMING_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        phases: Dict[str, float] = {}
+        token = _request_phases.set(phases)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _format_server_timing(phases, total))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_phases.reset(token)
+            route = scope.get("route")
+            logger.info(
+                orjson.dumps(
+                    {
+                        "event": "request_timing",
+                        "method": scope["method"],
+                        "route": getattr(route, "path", "unmatched"),
+                        "status": status_code,
+                        "total_ms": round((time.perf_counter() - start) * 1000, 3),
+                        "phases_ms": {
+                            name: round(seconds * 1000, 3)
+                            for name, seconds in phases.items()
+                        },
+                    }
+                ).decode()
+            )
+
+
+def _format_server_timing(phases: Dict[str, float], total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in phases.items()]
+    entries.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(entries)
+
+
+def setup_server_timing(app: FastAPI) -> None:
+    app.add_middleware(ServerTimingMiddleware)
@@ -1 +1,3 @@
 from .config import *
+from .watcher import *
+from .reads import *
@@ -1,5 +1,6 @@
 import os
 from pymongo.mongo_client import MongoClient
+from .monitoring import CommandMetricsListener
 
 MONGO_URL = os.getenv("MONGO_URL")
-client = MongoClient(MONGO_URL)
+client = MongoClient(MONGO_URL, event_listeners=[CommandMetricsListener()])
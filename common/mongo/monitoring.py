@@ -0,0 +1,23 @@
+from pymongo import monitoring
+from common.metrics import MONGO_COMMAND_DURATION, record_phase
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event, "success")
+
+    def failed(self, event):
+        self._observe(event, "failure")
+
+    @staticmethod
+    def _observe(event, outcome: str):
+        # Listeners run synchronously on the calling thread, so the request
+        # scoped phase breakdown is visible here.
+        seconds = event.duration_micros / 1_000_000
+        MONGO_COMMAND_DURATION.labels(
+            event.database_name, event.command_name, outcome
+        ).observe(seconds)
+        record_phase("mongo", seconds)
@@ -0,0 +1,59 @@
+import os
+from pymongo.collection import Collection
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+from typing import Dict, Iterable
+from .config import client
+
+__all__ = [
+    "MONGO_READ_PREFERENCE",
+    "MONGO_MAX_STALENESS",
+    "MONGO_READ_STALENESS",
+    "for_reads",
+    "projection",
+]
+
+# Used for list endpoints; detail reads and writes stay on the primary. A
+# standalone server ignores it.
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "secondaryPreferred")
+# Seconds a secondary may trail the primary and still be read. MongoDB
+# requires at least 90; -1 disables the bound.
+MONGO_MAX_STALENESS = int(os.getenv("MONGO_MAX_STALENESS", 90))
+
+_READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+if MONGO_READ_PREFERENCE == "primary":
+    _read_preference = Primary()
+    MONGO_READ_STALENESS = 0.0
+else:
+    _read_preference = _READ_PREFERENCES[MONGO_READ_PREFERENCE](
+        max_staleness=MONGO_MAX_STALENESS
+    )
+    # How far for_reads() results may trail the primary, for
+    # cache_with_expiry's max_staleness. The driver re-estimates a
+    # secondary's lag once per heartbeat, so add one. Unbounded reads are
+    # never cached.
+    MONGO_READ_STALENESS = (
+        MONGO_MAX_STALENESS + client.options.heartbeat_frequency
+        if MONGO_MAX_STALENESS >= 0
+        else float("inf")
+    )
+
+
+def for_reads(collection: Collection) -> Collection:
+    return collection.with_options(read_preference=_read_preference)
+
+
+def projection(fields: Iterable[str]) -> Dict[str, int]:
+    # _id is always returned and becomes the public id.
+    return {field: 1 for field in fields if field != "id"}
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import threading
+from bson import json_util
+from pymongo.collection import Collection
+from pymongo.errors import OperationFailure
+from typing import List, Optional
+from common.redis import invalidate_cache, redis_client
+
+__all__ = ["MONGO_CHANGE_STREAMS", "CacheWatcher", "start_cache_watchers"]
+
+# Change streams need a replica set, so watching is opt-in.
+MONGO_CHANGE_STREAMS = os.getenv("MONGO_CHANGE_STREAMS", "false").lower() == "true"
+WATCHER_BATCH_SIZE = int(os.getenv("WATCHER_BATCH_SIZE", 100))
+WATCHER_RETRY_INTERVAL = float(os.getenv("WATCHER_RETRY_INTERVAL", 5))
+
+logger = logging.getLogger("cache_watcher")
+
+_DOCUMENT_EVENTS = {"insert", "update", "replace", "delete"}
+_CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class CacheWatcher:
+    """Follows a collection's change stream and invalidates the matching
+    {detail_prefix}:{_id} keys and the list namespace, so writes made
+    outside the service (scripts, migrations, other services) reach the
+    cache too. The resume token is kept in Redis so a restart picks up where
+    the previous process stopped."""
+
+    def __init__(self, collection: Collection, detail_prefix: str, namespace: str):
+        self.collection = collection
+        self.detail_prefix = detail_prefix
+        self.namespace = namespace
+        self.token_key = f"{namespace}:change_stream_token"
+        self._token = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    async def start(self):
+        stored = await redis_client.get(self.token_key)
+        self._token = json_util.loads(stored) if stored else None
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.namespace}-cache-watcher", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._thread:
+            # The thread may be waiting on work scheduled on this loop.
+            await self._loop.run_in_executor(None, self._thread.join, 5)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self._follow()
+            except OperationFailure as exc:
+                if exc.code == _CHANGE_STREAM_HISTORY_LOST:
+                    # The oplog no longer covers the stored token: start from
+                    # now and drop every list page; detail keys age out by TTL.
+                    logger.warning("%s change stream history lost", self.namespace)
+                    self._apply([], None)
+                    continue
+                logger.exception("%s change stream failed", self.namespace)
+                self._stopping.wait(WATCHER_RETRY_INTERVAL)
+            except Exception:
+                logger.exception("%s change stream failed", self.namespace)
+                self._stopping.wait(WATCHER_RETRY_INTERVAL)
+
+    def _follow(self):
+        with self.collection.watch(
+            resume_after=self._token, max_await_time_ms=1000
+        ) as stream:
+            while stream.alive and not self._stopping.is_set():
+                changes = []
+                change = stream.try_next()
+                while change is not None:
+                    changes.append(change)
+                    if len(changes) >= WATCHER_BATCH_SIZE:
+                        break
+                    change = stream.try_next()
+                if not changes:
+                    continue
+                # An invalidate event (drop/rename) closes the stream and its
+                # token cannot be resumed from.
+                if changes[-1]["operationType"] == "invalidate":
+                    self._apply(changes, None)
+                else:
+                    self._apply(changes, changes[-1]["_id"])
+
+    def _apply(self, changes: List[dict], token: Optional[dict]):
+        keys = {
+            f"{self.detail_prefix}:{change['documentKey']['_id']}"
+            for change in changes
+            if change["operationType"] in _DOCUMENT_EVENTS
+        }
+        future = asyncio.run_coroutine_threadsafe(
+            self._invalidate(sorted(keys), token), self._loop
+        )
+        future.result(timeout=10)
+        self._token = token
+
+    async def _invalidate(self, keys: List[str], token: Optional[dict]):
+        await invalidate_cache(*keys, namespaces=[self.namespace])
+        if token is None:
+            await redis_client.delete(self.token_key)
+        else:
+            await redis_client.set(self.token_key, json_util.dumps(token))
+
+
+async def start_cache_watchers(*watchers: CacheWatcher) -> List[CacheWatcher]:
+    if not MONGO_CHANGE_STREAMS:
+        return []
+    for watcher in watchers:
+        await watcher.start()
+    return list(watchers)
@@ -1,2 +1,5 @@
 from .api_deps import *
 from .config import *
+from .concurrency import *
+from .listener import *
+from .replicas import *
@@ -1,10 +1,12 @@
 from sqlalchemy import select, func
 from typing import Dict, Any, Optional
+from common.metrics import timed_phase
 
 
 async def get_total_count(db_session, query) -> int:
     total_count_query = select(func.count()).select_from(query.subquery())
-    total_count_result = await db_session.execute(total_count_query)
+    with timed_phase("db"):
+        total_count_result = await db_session.execute(total_count_query)
     return total_count_result.scalar()
 
 
@@ -13,8 +15,18 @@ async def paginate_query(
 ) -> Dict[str, Any]:
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
-    result = await db_session.execute(query)
-    return result.scalars().all()
+    with timed_phase("db"):
+        result = await db_session.execute(query)
+        return result.scalars().all()
+
+
+async def paginate_rows(db_session, query, page: int, page_size: int):
+    """Like paginate_query, for column selects: returns one mapping per row."""
+    offset = (page - 1) * page_size
+    query = query.offset(offset).limit(page_size)
+    with timed_phase("db"):
+        result = await db_session.execute(query)
+        return result.mappings().all()
 
 
 async def cursor_paginate_query(
@@ -33,8 +45,9 @@ async def cursor_paginate_query(
         getattr(query.column_descriptions[0]["entity"], cursor_column)
     ).limit(page_size)
 
-    result = await db_session.execute(query)
-    rows = result.scalars().all()
+    with timed_phase("db"):
+        result = await db_session.execute(query)
+        rows = result.scalars().all()
 
     next_cursor = None
     if rows:
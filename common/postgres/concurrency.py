@@ -0,0 +1,51 @@
+from fastapi import HTTPException
+from http import HTTPStatus
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Optional, Set
+
+__all__ = ["etag", "parse_if_match", "check_version", "commit_versioned"]
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[Set[int]]:
+    """Versions listed in an If-Match header, or None when any version matches."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    versions = set()
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        try:
+            versions.add(int(tag.strip('"')))
+        except ValueError:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail="Malformed If-Match header"
+            )
+    return versions
+
+
+def check_version(current: int, expected: Optional[Set[int]]) -> None:
+    if expected is not None and current not in expected:
+        raise HTTPException(
+            status_code=HTTPStatus.PRECONDITION_FAILED,
+            detail="Resource has been modified",
+        )
+
+
+async def commit_versioned(session: AsyncSession) -> None:
+    # The mapper's version_id_col adds "AND version = :read_version" to the
+    # UPDATE; a concurrent writer makes it match no rows.
+    try:
+        await session.commit()
+    except StaleDataError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.PRECONDITION_FAILED,
+            detail="Resource has been modified",
+        )
@@ -1,7 +1,9 @@
 import os
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from .monitoring import instrument_engine
 
 load_dotenv()
 
@@ -11,15 +13,63 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+# JIT compilation costs more than it saves on short OLTP statements.
+DB_JIT = os.getenv("DB_JIT", "off")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", 5))
+
+# Comma-separated host[:port] list of streaming replicas for read endpoints.
+DB_READ_HOSTS = [
+    host.strip() for host in os.getenv("DB_READ_HOSTS", "").split(",") if host.strip()
+]
+DB_MAX_REPLICA_LAG = float(os.getenv("DB_MAX_REPLICA_LAG", 5))
+DB_LAG_CHECK_INTERVAL = float(os.getenv("DB_LAG_CHECK_INTERVAL", 2))
+# After a write, the client reads from the primary for this long.
+DB_STICKY_SECONDS = int(os.getenv("DB_STICKY_SECONDS", 5))
+READ_STICKY_COOKIE = "db_read_primary"
+
 DATABASE_URL = (
     f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+def build_engine(url: str, name: str):
+    engine = create_async_engine(
+        url,
+        echo=DB_ECHO,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={
+            "timeout": DB_CONNECT_TIMEOUT,
+            # asyncpg's own cache, and SQLAlchemy's cache of asyncpg statements.
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "server_settings": {"jit": DB_JIT},
+        },
+    )
+    instrument_engine(engine, name=name, slow_query_ms=DB_SLOW_QUERY_MS)
+    return engine
+
+
+engine = build_engine(DATABASE_URL, name="writer")
 async_session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
 
-async def get_db():
+async def get_db(request: Request, response: Response):
+    if DB_READ_HOSTS and request.method not in ("GET", "HEAD", "OPTIONS"):
+        response.set_cookie(
+            READ_STICKY_COOKIE, "1", max_age=DB_STICKY_SECONDS, httponly=True
+        )
     async with async_session() as session:
         yield session
         await session.commit()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import os
+import asyncpg
+from typing import Optional, Set
+from common.redis import invalidate_cache, redis_client
+from .config import DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME
+
+__all__ = ["CacheInvalidationListener"]
+
+LISTENER_DEBOUNCE = float(os.getenv("LISTENER_DEBOUNCE", 0.05))
+LISTENER_KEEPALIVE = float(os.getenv("LISTENER_KEEPALIVE", 30))
+LISTENER_RETRY_INTERVAL = float(os.getenv("LISTENER_RETRY_INTERVAL", 5))
+# How long a transaction stays claimed; notifications arrive within
+# milliseconds, this only has to outlast the slowest listener's debounce.
+LISTENER_CLAIM_TTL = int(os.getenv("LISTENER_CLAIM_TTL", 60))
+
+logger = logging.getLogger("cache_listener")
+
+
+class CacheInvalidationListener:
+    """LISTENs on a channel fed by the table's notify trigger and invalidates
+    {detail_prefix}:{id} for every changed row, so writes from the Go worker
+    or ad-hoc SQL reach the cache too.
+
+    List pages can't be keyed by row (a change can move a row onto or off
+    any page), so they are retired by bumping the whole list namespace.
+    Every service process runs a listener and hears every notification; a
+    process only bumps the namespace when it is the first to claim one of
+    the notifying transactions in Redis, so a change bumps it once rather
+    than once per process. A reconnect still bumps it unconditionally,
+    since changes made while that listener was away went unheard."""
+
+    def __init__(
+        self, channel: str, namespace: str, detail_prefix: Optional[str] = None
+    ):
+        self.channel = channel
+        self.namespace = namespace
+        self.detail_prefix = detail_prefix
+        self._pending: Set[str] = set()
+        self._transactions: Set[int] = set()
+        self._changed: Optional[asyncio.Event] = None
+
+    async def run(self):
+        # Created here, on the serving loop, so instances can be built at
+        # import time.
+        self._changed = asyncio.Event()
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("%s listener failed", self.channel)
+                await asyncio.sleep(LISTENER_RETRY_INTERVAL)
+
+    async def _listen(self):
+        connection = await asyncpg.connect(
+            user=DB_USER,
+            password=DB_PASSWORD,
+            host=DB_HOST,
+            port=DB_PORT,
+            database=DB_NAME,
+        )
+        try:
+            await connection.add_listener(self.channel, self._on_notify)
+            # Changes made while no connection was listening were missed.
+            await invalidate_cache(namespaces=[self.namespace])
+
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait(), timeout=LISTENER_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    # Surfaces a dead connection, which would otherwise
+                    # just stop delivering notifications.
+                    await connection.execute("SELECT 1")
+                    continue
+
+                await asyncio.sleep(LISTENER_DEBOUNCE)
+                self._changed.clear()
+                keys, self._pending = self._pending, set()
+                transactions, self._transactions = self._transactions, set()
+                claimed = await self._claim(transactions)
+                await invalidate_cache(
+                    *sorted(keys), namespaces=[self.namespace] if claimed else []
+                )
+        finally:
+            await connection.close()
+
+    async def _claim(self, transactions: Set[int]) -> bool:
+        if not transactions:
+            return False
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for tx in transactions:
+                pipe.set(
+                    f"{self.namespace}:notified:{tx}",
+                    1,
+                    nx=True,
+                    ex=LISTENER_CLAIM_TTL,
+                )
+            return any(await pipe.execute())
+
+    def _on_notify(self, connection, pid, channel, payload):
+        change = json.loads(payload)
+        self._transactions.add(change["tx"])
+        if self.detail_prefix:
+            self._pending.add(f"{self.detail_prefix}:{change['id']}")
+        self._changed.set()
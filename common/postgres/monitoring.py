@@ -0,0 +1,35 @@
+import logging
+import time
+from sqlalchemy import event
+from common.metrics import DB_QUERY_DURATION, DB_POOL_CONNECTIONS
+
+logger = logging.getLogger("slow_query")
+
+
+def instrument_engine(
+    engine, name: str = "writer", slow_query_ms: float = None
+) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        elapsed = time.perf_counter() - context._query_start_time
+        operation = statement.lstrip().split(None, 1)[0].upper()
+        DB_QUERY_DURATION.labels(operation).observe(elapsed)
+        # Parameters are left out: they can carry credentials and PII.
+        if slow_query_ms is not None and elapsed * 1000 >= slow_query_ms:
+            logger.warning("%.1fms %s", elapsed * 1000, statement)
+
+    # Read on scrape, so the gauges cost nothing on the request path.
+    pool = sync_engine.pool
+    for state, read in (
+        ("size", pool.size),
+        ("checked_out", pool.checkedout),
+        ("idle", pool.checkedin),
+        ("overflow", pool.overflow),
+    ):
+        DB_POOL_CONNECTIONS.labels(name, state).set_function(read)
@@ -0,0 +1,86 @@
+import itertools
+import logging
+import time
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from typing import List, Optional
+from . import config
+
+__all__ = ["Replica", "replicas", "get_read_db", "read_staleness"]
+
+logger = logging.getLogger("db_replicas")
+
+# Seconds behind the primary; 0 when every received WAL record is replayed,
+# since an idle primary would otherwise look like growing lag.
+_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class Replica:
+    """A reader engine for one streaming replica, with its replication lag
+    checked at most every DB_LAG_CHECK_INTERVAL seconds."""
+
+    def __init__(self, host: str):
+        host, _, port = host.partition(":")
+        self.name = f"reader:{host}"
+        url = (
+            f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}"
+            f"@{host}:{port or config.DB_PORT}/{config.DB_NAME}"
+        )
+        self.engine = config.build_engine(url, name=self.name)
+        self.session = sessionmaker(
+            bind=self.engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.lag: Optional[float] = None
+        self.checked_at = 0.0
+
+    async def usable(self) -> bool:
+        if time.monotonic() - self.checked_at >= config.DB_LAG_CHECK_INTERVAL:
+            # Set first so concurrent requests don't all probe at once.
+            self.checked_at = time.monotonic()
+            try:
+                async with self.engine.connect() as connection:
+                    self.lag = float(await connection.scalar(_LAG_QUERY))
+            except Exception:
+                logger.warning("%s lag check failed", self.name, exc_info=True)
+                self.lag = None
+        return self.lag is not None and self.lag <= config.DB_MAX_REPLICA_LAG
+
+
+replicas: List[Replica] = [Replica(host) for host in config.DB_READ_HOSTS]
+_next_replica = itertools.count()
+
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints: a replica in round robin, or the
+    primary when the client wrote recently, or no replica is within
+    DB_MAX_REPLICA_LAG."""
+    session_factory = config.async_session
+    staleness = 0.0
+    if replicas and config.READ_STICKY_COOKIE not in request.cookies:
+        start = next(_next_replica)
+        for offset in range(len(replicas)):
+            replica = replicas[(start + offset) % len(replicas)]
+            if await replica.usable():
+                session_factory = replica.session
+                # Lag was within bounds when last checked, and can have grown
+                # by at most the time since.
+                staleness = config.DB_MAX_REPLICA_LAG + config.DB_LAG_CHECK_INTERVAL
+                break
+
+    async with session_factory() as session:
+        session.info["staleness"] = staleness
+        yield session
+
+
+def read_staleness(session: AsyncSession) -> float:
+    """Seconds the session may trail the primary, for cache_with_expiry's
+    max_staleness; 0 for primary sessions."""
+    return session.info.get("staleness", 0.0)
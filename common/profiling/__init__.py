@@ -0,0 +1,3 @@
+from .profiler import *
+from .routes import router as profiler_router
+from .routes import setup_profiler
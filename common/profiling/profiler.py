@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional
+from starlette.routing import Match
+
+PROFILER_ADMIN_TOKEN = os.getenv("PROFILER_ADMIN_TOKEN")
+PROFILER_MAX_FRAMES = int(os.getenv("PROFILER_MAX_FRAMES", 64))
+
+_session: Optional["ProfileSession"] = None
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+class ProfileSession:
+    def __init__(
+        self,
+        mode: str,
+        route: Optional[str] = None,
+        max_requests: Optional[int] = None,
+        interval: float = 0.005,
+    ):
+        self.mode = mode
+        self.route = route
+        self.remaining = max_requests
+        self.interval = interval
+        self.tracks_requests = route is not None or max_requests is not None
+        self.active_requests = 0
+        self.stacks = Counter()
+        self.finished = asyncio.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._target_thread_id = threading.get_ident()
+
+    def start(self):
+        if self.mode == "memory":
+            tracemalloc.start(PROFILER_MAX_FRAMES)
+        else:
+            self._thread = threading.Thread(
+                target=self._sample, name="profiler-sampler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        if self.mode == "memory":
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            for stat in snapshot.statistics("traceback"):
+                stack = ";".join(
+                    f"{os.path.basename(frame.filename)}:{frame.lineno}"
+                    for frame in stat.traceback
+                )
+                self.stacks[stack] += stat.size
+        else:
+            self._stop.set()
+            self._thread.join()
+
+    def request_started(self):
+        self.active_requests += 1
+
+    def request_finished(self):
+        self.active_requests -= 1
+        if self.remaining is not None:
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.finished.set()
+
+    def matches(self, scope) -> bool:
+        if self.route is None:
+            return True
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", None) == self.route
+        return scope["path"] == self.route
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            if self.tracks_requests and self.active_requests == 0:
+                continue
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+
+def _collapse(frame) -> str:
+    frames = []
+    while frame is not None and len(frames) < PROFILER_MAX_FRAMES:
+        code = frame.f_code
+        frames.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+async def run_profile(
+    mode: str,
+    seconds: int,
+    max_requests: Optional[int] = None,
+    route: Optional[str] = None,
+    interval: float = 0.005,
+) -> str:
+    global _session
+    if _session is not None:
+        raise ProfilerBusy()
+
+    session = ProfileSession(mode, route, max_requests, interval)
+    session.start()
+    _session = session
+    try:
+        if max_requests is None:
+            await asyncio.sleep(seconds)
+        else:
+            try:
+                await asyncio.wait_for(session.finished.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _session = None
+        session.stop()
+
+    return session.collapsed()
+
+
+class ProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        session = _session
+        if (
+            session is None
+            or not session.tracks_requests
+            or scope["type"] != "http"
+            or not session.matches(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        session.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.request_finished()
@@ -0,0 +1,93 @@
+import hmac
+from http import HTTPStatus
+from typing import Optional
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from .profiler import (
+    PROFILER_ADMIN_TOKEN,
+    ProfilerBusy,
+    ProfilerMiddleware,
+    run_profile,
+)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not PROFILER_ADMIN_TOKEN:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(
+        x_admin_token, PROFILER_ADMIN_TOKEN
+    ):
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Forbidden")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+async def _profile_response(
+    mode: str,
+    seconds: int,
+    requests: Optional[int],
+    route: Optional[str],
+    interval_ms: int = 5,
+) -> PlainTextResponse:
+    try:
+        profile = await run_profile(
+            mode, seconds, requests, route, interval=interval_ms / 1000
+        )
+    except ProfilerBusy:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT, detail="A profile is already running"
+        )
+
+    return PlainTextResponse(
+        profile,
+        headers={
+            "Content-Disposition": f'attachment; filename="{mode}-profile.collapsed"'
+        },
+    )
+
+
+@router.post(
+    "/cpu",
+    status_code=HTTPStatus.OK,
+    response_class=PlainTextResponse,
+    summary="Capture CPU Profile",
+    description="Sample the event loop thread for N seconds, or for the next N "
+    "requests matching a route, and return collapsed stacks for flamegraph tools.",
+)
+async def profile_cpu(
+    seconds: int = Query(10, ge=1, le=300, description="Duration, or timeout"),
+    requests: Optional[int] = Query(
+        None, ge=1, le=10000, description="Stop after N matching requests"
+    ),
+    route: Optional[str] = Query(
+        None, description="Route template to profile, e.g. /expenses/{expense_id}"
+    ),
+    interval_ms: int = Query(5, ge=1, le=100, description="Sampling interval"),
+):
+    return await _profile_response("cpu", seconds, requests, route, interval_ms)
+
+
+@router.post(
+    "/memory",
+    status_code=HTTPStatus.OK,
+    response_class=PlainTextResponse,
+    summary="Capture Allocation Snapshot",
+    description="Trace allocations for N seconds, or for the next N requests "
+    "matching a route, and return bytes per stack in collapsed format.",
+)
+async def profile_memory(
+    seconds: int = Query(10, ge=1, le=300, description="Duration, or timeout"),
+    requests: Optional[int] = Query(
+        None, ge=1, le=10000, description="Stop after N matching requests"
+    ),
+    route: Optional[str] = Query(
+        None, description="Route template to profile, e.g. /expenses/{expense_id}"
+    ),
+):
+    return await _profile_response("memory", seconds, requests, route)
+
+
+def setup_profiler(app: FastAPI, prefix: str = "/admin/profiler") -> None:
+    app.add_middleware(ProfilerMiddleware)
+    app.include_router(router, prefix=prefix, tags=["admin"])
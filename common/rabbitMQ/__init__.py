@@ -1,3 +1,4 @@
 from .config import *
 from .api_deps import *
 from .workers import *
+from .outbox import *
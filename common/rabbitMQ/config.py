@@ -1,7 +1,9 @@
 import pika
 import json
 import os
+from pika.exceptions import AMQPError
 from dotenv import load_dotenv
+from common.metrics import RABBITMQ_PUBLISH_DURATION
 
 load_dotenv()
 
@@ -19,19 +21,55 @@ class RabbitMQConnection:
         self.connection = pika.BlockingConnection(params)
         self.channel = self.connection.channel()
         self.channel.queue_declare(queue=self.queue, durable=True)
+        # With confirms on, basic_publish raises when the broker nacks the
+        # message, or returns it as unroutable (mandatory), instead of
+        # dropping it silently.
+        self.channel.confirm_delivery()
+
+    def is_open(self) -> bool:
+        # No I/O: a connection the broker dropped only shows as closed once
+        # something services it (see ensure_open).
+        return bool(self.connection and self.connection.is_open)
+
+    def ensure_open(self):
+        """Services heartbeats on an open connection, so one the broker has
+        dropped is noticed, and connects when there is none."""
+        if self.is_open():
+            try:
+                self.connection.process_data_events(time_limit=0)
+                if not self.channel.is_closed:
+                    return
+            except AMQPError:
+                pass
+            self.connection = None
+            self.channel = None
+        self.connect()
+
+    def close(self):
+        if self.is_open():
+            self.connection.close()
+        self.connection = None
+        self.channel = None
 
     def publish(self, message: dict, routing_key: str = None, headers: dict = None):
-        if not self.channel:
+        if not self.channel or self.channel.is_closed:
             self.connect()
-        self.channel.basic_publish(
-            exchange="",
-            routing_key=routing_key or self.queue,
-            body=json.dumps(message),
-            properties=pika.BasicProperties(
-                headers=headers,
-                delivery_mode=2,
-            ),
-        )
+        routing_key = routing_key or self.queue
+        with RABBITMQ_PUBLISH_DURATION.labels(routing_key).time():
+            self.channel.basic_publish(
+                exchange="",
+                routing_key=routing_key,
+                body=json.dumps(message),
+                mandatory=True,
+                properties=pika.BasicProperties(
+                    headers=headers,
+                    delivery_mode=2,
+                ),
+            )
+
+    def publish_batch(self, messages):
+        for message, routing_key, headers in messages:
+            self.publish(message, routing_key=routing_key, headers=headers)
 
     def consume(self, callback):
         if not self.channel:
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import os
+from sqlalchemy import delete, select
+from common.postgres import config as postgres_config
+from common.rabbitMQ.config import RabbitMQConnection
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 0.5))
+# Wait between attempts while the broker or database is failing.
+OUTBOX_RETRY_INTERVAL = float(os.getenv("OUTBOX_RETRY_INTERVAL", 5))
+
+logger = logging.getLogger("outbox")
+
+
+class OutboxRelay:
+    """Drains an outbox table to RabbitMQ.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several relays (one per
+    worker process) can run side by side. Rows are deleted in the same
+    transaction once the broker has confirmed every publish, so a failed
+    publish rolls the batch back; delivery is at-least-once.
+
+    The broker connection is opened lazily and checked every poll, so the
+    app starts and takes submissions while RabbitMQ is down.
+    """
+
+    def __init__(
+        self,
+        outbox_model,
+        rabbitmq: RabbitMQConnection,
+        session_factory=None,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+    ):
+        self.outbox_model = outbox_model
+        self.rabbitmq = rabbitmq
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+    async def relay_batch(self) -> int:
+        model = self.outbox_model
+        # Looked up per batch, so a replaced async_session is picked up.
+        session_factory = self.session_factory or postgres_config.async_session
+        async with session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(model)
+                    .order_by(model.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                rows = result.scalars().all()
+                if not rows:
+                    return 0
+
+                messages = [(row.payload, row.routing_key, row.headers) for row in rows]
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.rabbitmq.publish_batch, messages)
+
+                await session.execute(
+                    delete(model).where(model.id.in_([row.id for row in rows]))
+                )
+        return len(rows)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        failing = False
+        while True:
+            try:
+                await loop.run_in_executor(None, self.rabbitmq.ensure_open)
+                relayed = await self.relay_batch()
+            except Exception:
+                # Once per outage rather than every poll.
+                if not failing:
+                    logger.exception("Outbox relay failed, retrying")
+                failing = True
+                relayed = 0
+            else:
+                if failing:
+                    logger.info("Outbox relay recovered")
+                failing = False
+
+            if failing:
+                await asyncio.sleep(OUTBOX_RETRY_INTERVAL)
+            elif relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
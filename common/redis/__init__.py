@@ -1,2 +1,6 @@
 from .config import *
 from .api_deps import *
+from .codec import *
+from .keys import *
+from .warming import *
+from .idempotency import *
@@ -1,63 +1,241 @@
-import orjson
-from typing import Callable, Any
-from .config import redis_client
-
-
-async def cache_with_expiry(key: str, data_fetcher: Callable[[], Any], ttl: int = 300):
-    cached_data = await redis_client.get(key)
-    if cached_data:
-        return orjson.loads(cached_data)
-
-    data = await data_fetcher()
-
-    await redis_client.set(key, orjson.dumps(data), ex=ttl)
+import time
+from contextvars import ContextVar
+from fastapi import HTTPException
+from http import HTTPStatus
+from typing import Awaitable, Callable, Any, Dict, Iterable, List, Optional
+from common.metrics import CACHE_REQUESTS, timed_phase
+from .config import redis_client, NEGATIVE_CACHE_TTL
+from .codec import encode, decode
+
+# Stored in place of a payload when the fetcher raised 404. Codec tags start
+# at 0x01, so the marker cannot collide with a cached value.
+_MISSING = b"\x00missing:"
+
+# Set by the cache warmer: lookups skip the stored value and rebuild it.
+refreshing_cache: ContextVar[bool] = ContextVar("refreshing_cache", default=False)
+
+# Lookups that touch more than one key run as Lua scripts, so each one is a
+# single round trip and cannot interleave with a concurrent writer.
+_GET_GENERATION_SCOPED = redis_client.register_script("""
+    local generation = redis.call('GET', KEYS[1]) or '0'
+    return {
+        generation,
+        redis.call('GET', KEYS[2]) or '0',
+        redis.call('GET', ARGV[1] .. ':gen=' .. generation),
+    }
+    """)
+
+_SET_IF_GENERATION = redis_client.register_script("""
+    if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+        return 0
+    end
+    redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+    return 1
+    """)
+
+_GET_AND_EXPIRE = redis_client.register_script("""
+    local value = redis.call('GET', KEYS[1])
+    if value and string.sub(value, 1, #ARGV[2]) ~= ARGV[2] then
+        redis.call('EXPIRE', KEYS[1], ARGV[1])
+    end
+    return value
+    """)
+
+_GET_WITH_ACCESS_LIMIT = redis_client.register_script("""
+    local value = redis.call('GET', KEYS[1])
+    if not value then
+        return false
+    end
+    if redis.call('INCR', KEYS[2]) < tonumber(ARGV[1]) then
+        return value
+    end
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return false
+    """)
+
+
+async def cache_with_expiry(
+    key: str,
+    data_fetcher: Callable[[], Any],
+    ttl: int = 300,
+    namespace: Optional[str] = None,
+    max_staleness: float = 0,
+):
+    """Caches data_fetcher() under key; keys in a namespace are dropped as a
+    group by invalidate_cache(namespaces=[...]).
+
+    max_staleness is how far behind the primary data_fetcher may read (a
+    replica or secondary). A namespaced result is then only stored if the
+    namespace was last invalidated longer ago than that, when the fetch
+    started, so the read cannot predate the write; and, like any namespaced
+    result, only if the namespace wasn't invalidated during the fetch."""
+    storable = True
+    with timed_phase("cache"):
+        if namespace:
+            started = time.time()
+            generation, invalidated_at, *cached = await _GET_GENERATION_SCOPED(
+                keys=[_generation_key(namespace), _invalidated_at_key(namespace)],
+                args=[key],
+            )
+            cached_data = cached[0] if cached else None
+            generation = generation.decode()
+            storable = started - float(invalidated_at) > max_staleness
+            key = f"{key}:gen={generation}"
+        else:
+            cached_data = await redis_client.get(key)
+        if cached_data and not refreshing_cache.get():
+            _record_lookup(key, hit=True)
+            return _load(cached_data)
+
+    _record_lookup(key, hit=False)
+    data = await _fetch(key, data_fetcher)
+
+    with timed_phase("cache"):
+        if not namespace:
+            await redis_client.set(key, encode(data), ex=ttl)
+        elif storable:
+            await _SET_IF_GENERATION(
+                keys=[_generation_key(namespace), key],
+                args=[generation, encode(data), ttl],
+            )
     return data
 
 
 async def cache_with_sliding_expiry(
     key: str, data_fetcher: Callable[[], Any], ttl: int = 300
 ):
-    cached_data = await redis_client.get(key)
-    if cached_data:
-        await redis_client.expire(key, ttl)
-        return orjson.loads(cached_data)
+    with timed_phase("cache"):
+        cached_data = await _GET_AND_EXPIRE(keys=[key], args=[ttl, _MISSING])
+        if cached_data:
+            _record_lookup(key, hit=True)
+            return _load(cached_data)
 
-    data = await data_fetcher()
+    _record_lookup(key, hit=False)
+    data = await _fetch(key, data_fetcher)
 
-    await redis_client.set(key, orjson.dumps(data), ex=ttl)
+    with timed_phase("cache"):
+        await redis_client.set(key, encode(data), ex=ttl)
     return data
 
 
 async def cache_with_access_limit(
     key: str, data_fetcher: Callable[[], Any], max_accesses: int = 10
 ):
-    cached_data = await redis_client.get(key)
     access_count_key = f"{key}:access_count"
 
-    if cached_data:
-        access_count = await redis_client.incr(access_count_key)
-
-        if access_count >= max_accesses:
-            await redis_client.delete(key)
-            await redis_client.delete(access_count_key)
-            return await cache_with_access_limit(key, data_fetcher, max_accesses)
-
-        return orjson.loads(cached_data)
+    with timed_phase("cache"):
+        cached_data = await _GET_WITH_ACCESS_LIMIT(
+            keys=[key, access_count_key], args=[max_accesses]
+        )
+        if cached_data:
+            _record_lookup(key, hit=True)
+            return decode(cached_data)
 
+    _record_lookup(key, hit=False)
     data = await data_fetcher()
 
-    await redis_client.set(key, orjson.dumps(data))
-    await redis_client.set(access_count_key, 0)
+    with timed_phase("cache"):
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(key, encode(data))
+            pipe.set(access_count_key, 0)
+            await pipe.execute()
     return data
 
 
-async def invalidate_cache(key: str):
-    await redis_client.delete(key)
-
-
-async def invalidate_pattern_cache(pattern: str = "*"):
-    print(pattern)
-    keys = await redis_client.keys(pattern)
-    print(keys)
-    if keys:
-        await redis_client.delete(*keys)
+async def cache_many(
+    ids: List[Any],
+    key_for: Callable[[Any], str],
+    data_fetcher: Callable[[List[Any]], Awaitable[Dict[Any, Any]]],
+    ttl: int = 300,
+    not_found: Callable[[Any], str] = lambda id: "Not found",
+) -> Dict[Any, Any]:
+    """Resolves many ids with one MGET; only the misses reach data_fetcher.
+    Ids it doesn't return are negatively cached with not_found(id) as the
+    detail the single-item lookup raises."""
+    if not ids:
+        return {}
+
+    keys = [key_for(id) for id in ids]
+    with timed_phase("cache"):
+        cached = await redis_client.mget(keys)
+
+    found = {}
+    missing = []
+    for id, cached_data in zip(ids, cached):
+        if not cached_data:
+            missing.append(id)
+        elif not cached_data.startswith(_MISSING):
+            found[id] = decode(cached_data)
+    _record_lookups(keys[0], hits=len(ids) - len(missing), misses=len(missing))
+
+    if missing:
+        fetched = await data_fetcher(missing)
+        with timed_phase("cache"):
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for id in missing:
+                    if id in fetched:
+                        pipe.set(key_for(id), encode(fetched[id]), ex=ttl)
+                    else:
+                        pipe.set(
+                            key_for(id),
+                            _MISSING + not_found(id).encode(),
+                            ex=NEGATIVE_CACHE_TTL,
+                        )
+                await pipe.execute()
+        found.update(fetched)
+    return found
+
+
+async def invalidate_cache(*keys: str, namespaces: Iterable[str] = ()):
+    """Deletes keys and retires every entry cached under namespaces in one
+    MULTI/EXEC round trip."""
+    with timed_phase("cache"):
+        async with redis_client.pipeline(transaction=True) as pipe:
+            if keys:
+                pipe.delete(*keys)
+            for namespace in namespaces:
+                pipe.incr(_generation_key(namespace))
+                pipe.set(_invalidated_at_key(namespace), time.time())
+            await pipe.execute()
+
+
+def _load(cached_data: bytes):
+    if cached_data.startswith(_MISSING):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=cached_data[len(_MISSING) :].decode() or "Not found",
+        )
+    return decode(cached_data)
+
+
+async def _fetch(key: str, data_fetcher: Callable[[], Any]):
+    try:
+        return await data_fetcher()
+    except HTTPException as exc:
+        if exc.status_code == HTTPStatus.NOT_FOUND:
+            with timed_phase("cache"):
+                await redis_client.set(
+                    key, _MISSING + str(exc.detail).encode(), ex=NEGATIVE_CACHE_TTL
+                )
+        raise
+
+
+def _generation_key(namespace: str) -> str:
+    return f"{namespace}:generation"
+
+
+def _invalidated_at_key(namespace: str) -> str:
+    return f"{namespace}:generation:at"
+
+
+def _record_lookup(key: str, hit: bool):
+    namespace = key.split(":", 1)[0]
+    CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+
+
+def _record_lookups(key: str, hits: int, misses: int):
+    namespace = key.split(":", 1)[0]
+    if hits:
+        CACHE_REQUESTS.labels(namespace, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(namespace, "miss").inc(misses)
@@ -0,0 +1,84 @@
+import datetime
+from abc import ABC, abstractmethod
+import msgpack
+import orjson
+import zstandard
+from typing import Any, Dict
+from .config import CACHE_CODEC, CACHE_COMPRESSION_THRESHOLD
+
+__all__ = ["Codec", "MsgpackCodec", "JSONCodec", "encode", "decode"]
+
+# Cached values are prefixed with one tag byte naming the codec, with
+# _COMPRESSED set when the payload is zstd-compressed. Tags sit below 0x20
+# (and avoid JSON whitespace), so entries written before the codec existed,
+# which are plain orjson text, are recognised by their first byte.
+_COMPRESSED = 0x10
+
+
+class Codec(ABC):
+    tag: int
+    name: str
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes: ...
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any: ...
+
+
+class MsgpackCodec(Codec):
+    tag = 0x01
+    name = "msgpack"
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=_to_primitive, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+class JSONCodec(Codec):
+    tag = 0x02
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+_codecs: Dict[int, Codec] = {
+    codec.tag: codec for codec in (MsgpackCodec(), JSONCodec())
+}
+_default = next(codec for codec in _codecs.values() if codec.name == CACHE_CODEC)
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def encode(data: Any, codec: Codec = None) -> bytes:
+    codec = codec or _default
+    payload = codec.dumps(data)
+    tag = codec.tag
+    if CACHE_COMPRESSION_THRESHOLD and len(payload) >= CACHE_COMPRESSION_THRESHOLD:
+        payload = _compressor.compress(payload)
+        tag |= _COMPRESSED
+    return bytes((tag,)) + payload
+
+
+def decode(raw: bytes) -> Any:
+    tag = raw[0]
+    if tag >= 0x20 or tag in b"\t\n\r":
+        return orjson.loads(raw)
+
+    payload = raw[1:]
+    if tag & _COMPRESSED:
+        payload = _decompressor.decompress(payload)
+    return _codecs[tag & ~_COMPRESSED].loads(payload)
+
+
+def _to_primitive(value: Any) -> Any:
+    # Mirrors what orjson emitted, so services see the same types on a hit.
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
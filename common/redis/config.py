@@ -4,7 +4,11 @@ import os
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
+CACHE_TTL = int(os.getenv("CACHE_TTL", 300))
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", 30))
+CACHE_CODEC = os.getenv("CACHE_CODEC", "msgpack")
+CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", 1024))
 
 REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
-redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
+redis_client = aioredis.from_url(REDIS_URL, decode_responses=False)
@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import hashlib
+import os
+import time
+import orjson
+from http import HTTPStatus
+from starlette.responses import JSONResponse
+from .config import redis_client
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 86400))
+IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", 30))
+IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 10))
+IDEMPOTENCY_POLL_INTERVAL = 0.05
+
+
+class IdempotencyMiddleware:
+    """Replays the stored response for retried requests carrying Idempotency-Key.
+
+    The first request with a key takes an in-progress marker (SET NX) and runs;
+    its response is stored for IDEMPOTENCY_TTL seconds. Concurrent duplicates
+    wait for that response instead of executing, and a key reused with a
+    different request body is rejected with 422.
+    """
+
+    def __init__(self, app, methods=("POST",)):
+        self.app = app
+        self.methods = set(methods)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(
+            b"%s %s?%s\n%s"
+            % (
+                scope["method"].encode(),
+                scope["path"].encode(),
+                scope["query_string"],
+                body,
+            )
+        ).hexdigest()
+        owner = hashlib.sha256(headers.get(b"authorization", b"")).hexdigest()[:16]
+        key = f"idempotency:{owner}:{scope['path']}:{idempotency_key.decode('latin-1')}"
+
+        deadline = time.monotonic() + IDEMPOTENCY_WAIT_TIMEOUT
+        while True:
+            acquired = await redis_client.set(
+                key,
+                orjson.dumps({"state": "in_progress", "fingerprint": fingerprint}),
+                nx=True,
+                ex=IDEMPOTENCY_LOCK_TTL,
+            )
+            if acquired:
+                await self._execute(scope, body, receive, send, key, fingerprint)
+                return
+
+            stored = await redis_client.get(key)
+            record = orjson.loads(stored) if stored else None
+            if record and record["fingerprint"] != fingerprint:
+                await _error(
+                    scope,
+                    send,
+                    HTTPStatus.UNPROCESSABLE_ENTITY,
+                    "Idempotency-Key was already used with a different request",
+                )
+                return
+            if record and record["state"] == "completed":
+                await _replay(record, send)
+                return
+            if time.monotonic() >= deadline:
+                await _error(
+                    scope,
+                    send,
+                    HTTPStatus.CONFLICT,
+                    "A request with this Idempotency-Key is still in progress",
+                )
+                return
+            await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL)
+
+    async def _execute(self, scope, body, receive, send, key, fingerprint):
+        response = {"status": 500, "headers": [], "body": bytearray()}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, _receive_body(body, receive), send_wrapper)
+        except Exception:
+            await redis_client.delete(key)
+            raise
+
+        if response["status"] >= 500:
+            await redis_client.delete(key)
+            return
+
+        await redis_client.set(
+            key,
+            orjson.dumps(
+                {
+                    "state": "completed",
+                    "fingerprint": fingerprint,
+                    "status": response["status"],
+                    "headers": response["headers"],
+                    "body": base64.b64encode(response["body"]).decode(),
+                }
+            ),
+            ex=IDEMPOTENCY_TTL,
+        )
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+def _receive_body(body: bytes, receive):
+    sent = False
+
+    async def receive_wrapper():
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return receive_wrapper
+
+
+async def _replay(record: dict, send):
+    headers = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        for name, value in record["headers"]
+    ]
+    headers.append((b"idempotent-replayed", b"true"))
+    await send(
+        {"type": "http.response.start", "status": record["status"], "headers": headers}
+    )
+    await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+
+
+async def _error(scope, send, status: HTTPStatus, detail: str):
+    response = JSONResponse({"detail": detail}, status_code=status)
+    await response(scope, None, send)
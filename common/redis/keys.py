@@ -0,0 +1,21 @@
+import hashlib
+import orjson
+from typing import Any
+
+__all__ = ["build_cache_key"]
+
+
+def build_cache_key(namespace: str, **params: Any) -> str:
+    """Canonical cache key for a list query.
+
+    Callers pass parameters with their defaults already resolved, so that
+    requests running the same query share one entry. Unset filters (None or
+    "") are dropped and parameter order does not matter.
+    """
+    canonical = {
+        name: value for name, value in params.items() if value not in (None, "")
+    }
+    digest = hashlib.blake2b(
+        orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS), digest_size=12
+    ).hexdigest()
+    return f"{namespace}:{digest}"
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+import random
+import orjson
+from typing import Any, Awaitable, Callable, Dict, Set
+from .api_deps import refreshing_cache
+from .config import redis_client
+
+__all__ = ["record_access", "CacheWarmer"]
+
+CACHE_ACCESS_SAMPLE_RATE = float(os.getenv("CACHE_ACCESS_SAMPLE_RATE", 0.05))
+CACHE_WARM_TOP_N = int(os.getenv("CACHE_WARM_TOP_N", 20))
+CACHE_WARM_INTERVAL = float(os.getenv("CACHE_WARM_INTERVAL", 60))
+# Scores are multiplied by this every interval, so yesterday's hot pages
+# give way to today's.
+CACHE_WARM_DECAY = float(os.getenv("CACHE_WARM_DECAY", 0.95))
+CACHE_WARM_TRACKED = int(os.getenv("CACHE_WARM_TRACKED", 1000))
+
+logger = logging.getLogger("cache_warmer")
+
+# Counter updates in flight; held so they aren't garbage collected early.
+_recording: Set[asyncio.Task] = set()
+
+
+async def record_access(namespace: str, params: Dict[str, Any]):
+    """Counts a sampled request for a list query so the warmer knows which
+    ones are hot; params must be valid keyword arguments for its warmer.
+    The count is sent in the background, so the request doesn't wait on an
+    extra Redis round trip."""
+    if refreshing_cache.get() or random.random() >= CACHE_ACCESS_SAMPLE_RATE:
+        return
+    member = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+    task = asyncio.create_task(redis_client.zincrby(_counter_key(namespace), 1, member))
+    _recording.add(task)
+    task.add_done_callback(_recorded)
+
+
+class CacheWarmer:
+    """Re-runs the most requested list queries of each namespace at startup
+    and then every CACHE_WARM_INTERVAL, bypassing the cached value, so hot
+    pages are rebuilt before they expire instead of on a user's request."""
+
+    def __init__(self, warmers: Dict[str, Callable[..., Awaitable[Any]]]):
+        self.warmers = warmers
+
+    async def run(self):
+        while True:
+            for namespace, warm in self.warmers.items():
+                try:
+                    await self.warm(namespace, warm)
+                except Exception:
+                    logger.exception("warming %s failed", namespace)
+            await asyncio.sleep(CACHE_WARM_INTERVAL)
+
+    async def warm(self, namespace: str, warm: Callable[..., Awaitable[Any]]):
+        counter_key = _counter_key(namespace)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.zrevrange(counter_key, 0, CACHE_WARM_TOP_N - 1)
+            pipe.zremrangebyrank(counter_key, 0, -CACHE_WARM_TRACKED - 1)
+            pipe.zunionstore(counter_key, {counter_key: CACHE_WARM_DECAY})
+            hot, _, _ = await pipe.execute()
+
+        token = refreshing_cache.set(True)
+        try:
+            for member in hot:
+                try:
+                    await warm(**orjson.loads(member))
+                except Exception:
+                    logger.exception("warming %s %s failed", namespace, member)
+        finally:
+            refreshing_cache.reset(token)
+
+
+def _recorded(task: asyncio.Task):
+    _recording.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning("recording access failed: %r", task.exception())
+
+
+def _counter_key(namespace: str) -> str:
+    return f"cache:hot:{namespace}"
@@ -1 +1,2 @@
 from .generics import *
+from .fields import *
@@ -0,0 +1,47 @@
+from fastapi import HTTPException
+from functools import lru_cache
+from pydantic import BaseModel, create_model
+from typing import FrozenSet, Iterable, List, Optional, Type
+
+__all__ = ["parse_fields", "partial_model", "partial_page_model"]
+
+
+def parse_fields(
+    fields: Optional[str], model: Type[BaseModel], default: Iterable[str]
+) -> FrozenSet[str]:
+    """Resolves a comma-separated fields= value against model, falling back
+    to default; id is always included."""
+    if fields:
+        selected = {field.strip() for field in fields.split(",") if field.strip()}
+    else:
+        selected = set(default)
+
+    unknown = selected - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return frozenset(selected | {"id"})
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    return create_model(
+        f"{model.__name__}Fields",
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+@lru_cache(maxsize=256)
+def partial_page_model(
+    page_model: Type[BaseModel], item_model: Type[BaseModel], fields: FrozenSet[str]
+) -> Type[BaseModel]:
+    return create_model(
+        page_model.__name__,
+        __base__=page_model,
+        data=(List[partial_model(item_model, fields)], ...),
+    )